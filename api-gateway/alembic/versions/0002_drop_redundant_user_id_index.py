@@ -0,0 +1,24 @@
+"""Drop ix_transactions_user_id — covered by ix_transactions_user_id_created
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-14 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # (user_id, created_at) serves every `WHERE user_id = ?` lookup on its own
+    op.drop_index("ix_transactions_user_id", table_name="transactions")
+
+
+def downgrade() -> None:
+    op.create_index("ix_transactions_user_id", "transactions", ["user_id"])
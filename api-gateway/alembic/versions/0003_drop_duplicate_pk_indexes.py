@@ -0,0 +1,29 @@
+"""Drop duplicate ix_<table>_id indexes on UUID primary keys
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-14 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_TABLES = ("users", "transactions", "alerts")
+
+
+def upgrade() -> None:
+    # 0001 never created these, but databases bootstrapped via
+    # Base.metadata.create_all() got one per table from UUIDMixin(index=True).
+    for table in _TABLES:
+        op.execute(f"DROP INDEX IF EXISTS ix_{table}_id")
+
+
+def downgrade() -> None:
+    # The primary-key index already covers `id`; nothing to restore.
+    pass
@@ -0,0 +1,58 @@
+"""Store status / risk_level / role as SMALLINT codes instead of PG enums
+
+Codes are the declaration index of the Python enums (see models.base.SmallIntEnum).
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-14 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, column, enum type name, labels in code order, default label, nullable)
+_COLUMNS = (
+    ("users", "role", "user_role", ("USER", "ADMIN"), "USER", False),
+    ("transactions", "status", "transaction_status", ("PENDING", "APPROVED", "FLAGGED", "BLOCKED"), "PENDING", False),
+    ("transactions", "risk_level", "risk_level", ("LOW", "MEDIUM", "HIGH"), None, True),
+)
+
+
+def upgrade() -> None:
+    for table, column, type_name, labels, default, nullable in _COLUMNS:
+        cases = " ".join(f"WHEN '{label}' THEN {code}" for code, label in enumerate(labels))
+        op.alter_column(table, column, server_default=None)
+        op.alter_column(
+            table,
+            column,
+            type_=sa.SmallInteger(),
+            existing_nullable=nullable,
+            postgresql_using=f"CASE {column}::text {cases} END",
+        )
+        if default is not None:
+            op.alter_column(table, column, server_default=sa.text(str(labels.index(default))))
+        op.execute(f"DROP TYPE IF EXISTS {type_name}")
+
+
+def downgrade() -> None:
+    for table, column, type_name, labels, default, nullable in _COLUMNS:
+        enum_type = sa.Enum(*labels, name=type_name)
+        enum_type.create(op.get_bind(), checkfirst=True)
+        cases = " ".join(f"WHEN {code} THEN '{label}'" for code, label in enumerate(labels))
+        op.alter_column(table, column, server_default=None)
+        op.alter_column(
+            table,
+            column,
+            type_=enum_type,
+            existing_nullable=nullable,
+            postgresql_using=f"(CASE {column} {cases} END)::{type_name}",
+        )
+        if default is not None:
+            op.alter_column(table, column, server_default=default)
@@ -0,0 +1,140 @@
+"""Partition transactions by month on created_at
+
+The partition key has to be part of every unique constraint, so the primary
+key becomes (id, created_at) and alerts reference transactions through a
+composite foreign key carrying the parent's created_at.
+
+Monthly partitions are pre-created for _FIRST_MONTH .. _LAST_MONTH; anything
+outside that window lands in transactions_default until the next window is
+added by a follow-up revision.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-14 00:00:00.000000
+"""
+
+from typing import Iterator, Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects.postgresql import UUID
+
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_FIRST_MONTH = (2025, 1)
+_LAST_MONTH = (2027, 12)
+
+_COLUMNS = (
+    "id, user_id, amount, currency, location, device_id, ip_address, transaction_time, "
+    "status, rule_score, ml_score, final_score, risk_level, created_at, updated_at"
+)
+
+
+def _months() -> Iterator[tuple[int, int]]:
+    year, month = _FIRST_MONTH
+    while (year, month) <= _LAST_MONTH:
+        yield year, month
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def _transaction_columns() -> list[sa.Column]:
+    return [
+        sa.Column("id", UUID(as_uuid=True), nullable=False),
+        sa.Column("user_id", UUID(as_uuid=True), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("amount", sa.Numeric(precision=18, scale=2), nullable=False),
+        sa.Column("currency", sa.String(3), nullable=False, server_default="USD"),
+        sa.Column("location", sa.String(256), nullable=True),
+        sa.Column("device_id", sa.String(128), nullable=True),
+        sa.Column("ip_address", sa.String(45), nullable=True),
+        sa.Column("transaction_time", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("status", sa.SmallInteger, nullable=False, server_default=sa.text("0")),
+        sa.Column("rule_score", sa.Float, nullable=True),
+        sa.Column("ml_score", sa.Float, nullable=True),
+        sa.Column("final_score", sa.Float, nullable=True),
+        sa.Column("risk_level", sa.SmallInteger, nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    ]
+
+
+def _move_aside_transactions() -> None:
+    """Rename the current table and free up its index names."""
+    op.drop_constraint("alerts_transaction_id_fkey", "alerts", type_="foreignkey")
+    op.rename_table("transactions", "transactions_old")
+    op.drop_index("ix_transactions_user_id_created", table_name="transactions_old")
+    op.drop_index("ix_transactions_status", table_name="transactions_old")
+    op.execute("ALTER INDEX transactions_pkey RENAME TO transactions_old_pkey")
+
+
+def _create_transaction_indexes() -> None:
+    op.create_index("ix_transactions_user_id_created", "transactions", ["user_id", "created_at"])
+    op.create_index("ix_transactions_status", "transactions", ["status"])
+
+
+def upgrade() -> None:
+    _move_aside_transactions()
+
+    op.create_table(
+        "transactions",
+        *_transaction_columns(),
+        sa.PrimaryKeyConstraint("id", "created_at", name="transactions_pkey"),
+        postgresql_partition_by="RANGE (created_at)",
+    )
+    for year, month in _months():
+        next_year, next_month = (year + 1, 1) if month == 12 else (year, month + 1)
+        op.execute(
+            f"CREATE TABLE transactions_{year}_{month:02d} PARTITION OF transactions "
+            f"FOR VALUES FROM ('{year}-{month:02d}-01') TO ('{next_year}-{next_month:02d}-01')"
+        )
+    op.execute("CREATE TABLE transactions_default PARTITION OF transactions DEFAULT")
+
+    op.execute(f"INSERT INTO transactions ({_COLUMNS}) SELECT {_COLUMNS} FROM transactions_old")
+    op.drop_table("transactions_old")
+    _create_transaction_indexes()
+
+    op.add_column("alerts", sa.Column("transaction_created_at", sa.DateTime(timezone=True), nullable=True))
+    op.execute(
+        "UPDATE alerts SET transaction_created_at = t.created_at "
+        "FROM transactions t WHERE t.id = alerts.transaction_id"
+    )
+    op.alter_column("alerts", "transaction_created_at", nullable=False)
+    op.create_foreign_key(
+        "alerts_transaction_fkey",
+        "alerts",
+        "transactions",
+        ["transaction_id", "transaction_created_at"],
+        ["id", "created_at"],
+        ondelete="CASCADE",
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("alerts_transaction_fkey", "alerts", type_="foreignkey")
+    op.drop_column("alerts", "transaction_created_at")
+
+    op.rename_table("transactions", "transactions_old")
+    op.drop_index("ix_transactions_user_id_created", table_name="transactions_old")
+    op.drop_index("ix_transactions_status", table_name="transactions_old")
+    op.execute("ALTER INDEX transactions_pkey RENAME TO transactions_old_pkey")
+
+    op.create_table(
+        "transactions",
+        *_transaction_columns(),
+        sa.PrimaryKeyConstraint("id", name="transactions_pkey"),
+    )
+    op.execute(f"INSERT INTO transactions ({_COLUMNS}) SELECT {_COLUMNS} FROM transactions_old")
+    # Dropping the parent drops every partition with it
+    op.drop_table("transactions_old")
+    _create_transaction_indexes()
+
+    op.create_foreign_key(
+        "alerts_transaction_id_fkey",
+        "alerts",
+        "transactions",
+        ["transaction_id"],
+        ["id"],
+        ondelete="CASCADE",
+    )
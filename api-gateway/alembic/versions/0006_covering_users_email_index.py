@@ -0,0 +1,32 @@
+"""Make ix_users_email a covering index for the login lookup
+
+Login selects the whole user row by email; with the remaining columns in
+INCLUDE the lookup can be answered by an index-only scan.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-14 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_INCLUDE = ["id", "hashed_password", "role", "is_active", "created_at", "updated_at"]
+
+
+def upgrade() -> None:
+    op.drop_index("ix_users_email", table_name="users")
+    op.create_index(
+        "ix_users_email", "users", ["email"], unique=True, postgresql_include=_INCLUDE,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_users_email", table_name="users")
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
@@ -0,0 +1,37 @@
+"""Store transactions.amount as BIGINT cents instead of NUMERIC(18,2)
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-14 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0007"
+down_revision: Union[str, None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Altering the partitioned parent rewrites every partition
+    op.alter_column(
+        "transactions",
+        "amount",
+        type_=sa.BigInteger(),
+        existing_nullable=False,
+        postgresql_using="round(amount * 100)::bigint",
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        "transactions",
+        "amount",
+        type_=sa.Numeric(precision=18, scale=2),
+        existing_nullable=False,
+        postgresql_using="amount / 100.0",
+    )
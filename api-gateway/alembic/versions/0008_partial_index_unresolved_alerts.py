@@ -0,0 +1,29 @@
+"""Partial index on unresolved alerts for list_unresolved
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-14 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0008"
+down_revision: Union[str, None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_alerts_unresolved_created",
+        "alerts",
+        [sa.text("created_at DESC")],
+        postgresql_where=sa.text("resolved IS false"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_alerts_unresolved_created", table_name="alerts")
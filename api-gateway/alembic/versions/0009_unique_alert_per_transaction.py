@@ -0,0 +1,44 @@
+"""One alert per transaction and alert type
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-14 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0009"
+down_revision: Union[str, None] = "0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Redelivered scoring tasks may already have written duplicates; keep the
+    # earliest alert of each group. Older rows have uuid4 ids, so order by
+    # created_at and only break ties on id.
+    op.execute(
+        sa.text(
+            "DELETE FROM alerts a USING alerts b "
+            "WHERE a.transaction_id = b.transaction_id "
+            "AND a.transaction_created_at = b.transaction_created_at "
+            "AND a.alert_type = b.alert_type "
+            "AND (a.created_at, a.id) > (b.created_at, b.id)"
+        )
+    )
+    op.create_index(
+        "uq_alerts_transaction_alert_type",
+        "alerts",
+        ["transaction_id", "transaction_created_at", "alert_type"],
+        unique=True,
+    )
+    # The unique index leads with transaction_id, so it serves those lookups too
+    op.drop_index("ix_alerts_transaction_id", table_name="alerts")
+
+
+def downgrade() -> None:
+    op.create_index("ix_alerts_transaction_id", "alerts", ["transaction_id"])
+    op.drop_index("uq_alerts_transaction_alert_type", table_name="alerts")
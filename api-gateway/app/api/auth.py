@@ -7,23 +7,28 @@ Endpoints:
     GET  /auth/me        — return the current authenticated user
 """
 
+import redis.asyncio as aioredis
 from fastapi import APIRouter, Depends
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
+from app.core.redis import get_redis
 from app.core.security import get_current_user
-from app.models.user import User
-from app.schemas.user import Token, UserCreate, UserResponse
+from app.schemas.user import CurrentUser, Token, UserCreate, UserResponse
 from app.services.auth_service import AuthService
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
 @router.post("/register", response_model=UserResponse, status_code=201)
-async def register(payload: UserCreate, db: AsyncSession = Depends(get_db)):
+async def register(
+    payload: UserCreate,
+    db: AsyncSession = Depends(get_db),
+    redis: aioredis.Redis | None = Depends(get_redis),
+):
     """Register a new user account."""
-    service = AuthService(db)
+    service = AuthService(db, redis)
     return await service.register(payload)
 
 
@@ -31,16 +36,17 @@ async def register(payload: UserCreate, db: AsyncSession = Depends(get_db)):
 async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: AsyncSession = Depends(get_db),
+    redis: aioredis.Redis | None = Depends(get_redis),
 ):
     """Authenticate with email + password and receive a JWT access token.
 
     NOTE: OAuth2PasswordRequestForm uses 'username' field — we treat it as email.
     """
-    service = AuthService(db)
+    service = AuthService(db, redis)
     return await service.login(email=form_data.username, password=form_data.password)
 
 
 @router.get("/me", response_model=UserResponse)
-async def get_me(current_user: User = Depends(get_current_user)):
+async def get_me(current_user: CurrentUser = Depends(get_current_user)):
     """Return the currently authenticated user's profile."""
     return UserResponse.model_validate(current_user)
@@ -1,26 +1,34 @@
 """
-Health check endpoint.
+Health check endpoints.
 
-Verifies connectivity to PostgreSQL and Redis.
+``/health`` verifies connectivity to PostgreSQL and Redis. Probe results are
+cached in-process for a few seconds so bursts of liveness checks don't consume
+DB pool slots meant for real traffic. ``/health/pool`` reports connection-pool
+utilisation without touching the database.
 """
 
+import asyncio
+import time
+from typing import Any
+
 from fastapi import APIRouter, Depends
 import redis.asyncio as aioredis
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.core.database import get_db, pool_stats
 from app.core.redis import get_redis
 
 router = APIRouter(tags=["Health"])
 
+HEALTH_CACHE_TTL_SECONDS = 5.0
 
-@router.get("/health")
-async def health_check(
-    db: AsyncSession = Depends(get_db),
-    redis: aioredis.Redis = Depends(get_redis),
-):
-    """System health probe — checks DB and Redis connectivity."""
+_cache: dict[str, Any] = {"expires": 0.0, "payload": None}
+_cache_lock = asyncio.Lock()
+
+
+async def _probe(db: AsyncSession, redis: aioredis.Redis | None) -> dict[str, Any]:
+    """Run the actual DB and Redis connectivity checks."""
     checks: dict[str, str] = {}
 
     # PostgreSQL
@@ -45,3 +53,29 @@ async def health_check(
         "status": "healthy" if overall else "degraded",
         "services": checks,
     }
+
+
+@router.get("/health")
+async def health_check(
+    db: AsyncSession = Depends(get_db),
+    redis: aioredis.Redis = Depends(get_redis),
+):
+    """System health probe — checks DB and Redis connectivity (cached for 5 s)."""
+    if time.monotonic() < _cache["expires"]:
+        return _cache["payload"]
+
+    async with _cache_lock:
+        # Another request may have refreshed the cache while we waited
+        if time.monotonic() < _cache["expires"]:
+            return _cache["payload"]
+
+        payload = await _probe(db, redis)
+        _cache["payload"] = payload
+        _cache["expires"] = time.monotonic() + HEALTH_CACHE_TTL_SECONDS
+    return payload
+
+
+@router.get("/health/pool")
+async def pool_health():
+    """Connection-pool utilisation for monitoring (no DB round trip)."""
+    return {"postgres": pool_stats()}
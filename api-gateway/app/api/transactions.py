@@ -16,8 +16,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
 from app.core.redis import get_redis
 from app.core.security import get_current_user
-from app.models.user import User
 from app.schemas.transaction import TransactionCreate, TransactionList, TransactionResponse
+from app.schemas.user import CurrentUser
 from app.services.transaction_service import TransactionService
 
 router = APIRouter(prefix="/transactions", tags=["Transactions"])
@@ -34,7 +34,7 @@ def _get_service(
 @router.post("/", response_model=TransactionResponse, status_code=201)
 async def create_transaction(
     payload: TransactionCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     service: TransactionService = Depends(_get_service),
 ):
     """Submit a new transaction. It will be queued for async risk evaluation."""
@@ -44,7 +44,7 @@ async def create_transaction(
 @router.get("/{txn_id}", response_model=TransactionResponse)
 async def get_transaction(
     txn_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     service: TransactionService = Depends(_get_service),
 ):
     """Retrieve a transaction by ID. Returns cached result if available."""
@@ -55,10 +55,15 @@ async def get_transaction(
 async def list_transactions(
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
-    current_user: User = Depends(get_current_user),
+    cursor: str | None = Query(None, description="next_cursor from the previous page"),
+    current_user: CurrentUser = Depends(get_current_user),
     service: TransactionService = Depends(_get_service),
 ):
-    """List the current user's transactions (paginated)."""
+    """List the current user's transactions (paginated).
+
+    Pass the previous response's ``next_cursor`` for constant-cost deep paging;
+    ``skip`` is kept for backwards compatibility and ignored when a cursor is given.
+    """
     return await service.list_user_transactions(
-        user_id=current_user.id, skip=skip, limit=limit,
+        user_id=current_user.id, skip=skip, limit=limit, cursor=cursor,
     )
@@ -4,40 +4,161 @@ Async SQLAlchemy engine, session factory, and FastAPI dependency.
 Supports both PostgreSQL (production) and SQLite (local development).
 """
 
-from collections.abc import AsyncGenerator
+import asyncio
+from collections.abc import AsyncGenerator, Sequence
+from typing import Any
+from uuid import uuid4
 
+from sqlalchemy import column, event, insert, table
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.orm import ORMExecuteState, Session
+from sqlalchemy.pool import QueuePool
 
 from app.core.config import settings
 
 # SQLite doesn't support connection pooling options
 _is_sqlite = settings.database_url.startswith("sqlite")
-_engine_kwargs: dict = {"echo": False}
+# insertmanyvalues batches executemany() INSERTs into multi-row INSERT … RETURNING
+# query_cache_size: room for every repository statement without LRU churn
+_engine_kwargs: dict = {
+    "echo": False,
+    "insertmanyvalues_page_size": 1000,
+    "query_cache_size": 2000,
+}
 
 if not _is_sqlite:
-    _engine_kwargs.update(pool_size=20, max_overflow=10, pool_pre_ping=True)
+    _engine_kwargs.update(
+        pool_size=50,
+        max_overflow=50,
+        pool_pre_ping=True,
+        pool_recycle=1800,
+        connect_args={
+            # asyncpg's type introspection on connect can trigger PG JIT compilation
+            "server_settings": {"jit": "off", "application_name": "riskforge-gw"},
+            # asyncpg-level and SQLAlchemy-adapter prepared statement caches
+            "statement_cache_size": 1024,
+            "prepared_statement_cache_size": 1024,
+        },
+    )
+    if settings.database_pgbouncer:
+        # Server connections are shared between clients, so named prepared
+        # statements must not be cached or reused across transactions.
+        _engine_kwargs["connect_args"].update(
+            statement_cache_size=0,
+            prepared_statement_cache_size=0,
+            prepared_statement_name_func=lambda: f"__asyncpg_{uuid4()}__",
+        )
+
+# Connections opened eagerly at startup so early requests skip connect latency
+POOL_WARM_SIZE = 20
 
 engine = create_async_engine(settings.database_url, **_engine_kwargs)
 
+_WRITES_KEY = "has_writes"
+
+
+class WriteTrackingSession(Session):
+    """Session that records in ``info`` whether it has flushed or executed DML."""
+
+
+@event.listens_for(WriteTrackingSession, "after_flush")
+def _mark_flush(session: Session, flush_context: Any) -> None:
+    session.info[_WRITES_KEY] = True
+
+
+@event.listens_for(WriteTrackingSession, "do_orm_execute")
+def _mark_dml(orm_execute_state: ORMExecuteState) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info[_WRITES_KEY] = True
+
+
+def _has_writes(session: AsyncSession) -> bool:
+    """True if the session flushed, ran DML, or still holds unflushed changes."""
+    return bool(
+        session.info.get(_WRITES_KEY)
+        or session.new
+        or session.dirty
+        or session.deleted
+    )
+
+
 async_session_factory = async_sessionmaker(
     bind=engine,
     class_=AsyncSession,
+    sync_session_class=WriteTrackingSession,
     expire_on_commit=False,
 )
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    """FastAPI dependency – yields an async DB session and closes on teardown."""
+    """FastAPI dependency – yields an async DB session and closes on teardown.
+
+    Only requests that actually wrote are committed; read-only requests skip
+    the COMMIT round trip and their transaction is rolled back when the
+    connection is returned to the pool.
+    """
     async with async_session_factory() as session:
         try:
             yield session
-            await session.commit()
+            if _has_writes(session):
+                await session.commit()
         except Exception:
             await session.rollback()
             raise
         finally:
             await session.close()
+
+
+def pool_stats() -> dict[str, int] | None:
+    """Snapshot of the engine's connection pool, or None for non-queue pools (SQLite)."""
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        return None
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+    }
+
+
+async def warm_pool(size: int = POOL_WARM_SIZE) -> None:
+    """Open ``size`` pooled connections in parallel and return them to the pool."""
+    if _is_sqlite:
+        return
+    connections = await asyncio.gather(*(engine.connect() for _ in range(size)))
+    await asyncio.gather(*(conn.close() for conn in connections))
+
+
+async def bulk_copy(
+    table_name: str,
+    records: Sequence[Sequence[Any]],
+    columns: Sequence[str],
+) -> None:
+    """Bulk-load rows into a table in a single round trip.
+
+    On PostgreSQL this streams the records through asyncpg's binary COPY
+    protocol, which skips per-row parsing and planning entirely — prefer it
+    for batches of ~100 rows or more. SQLite falls back to a multi-row INSERT.
+
+    Args:
+        table_name: Target table name.
+        records: Row tuples, in the same order as ``columns``.
+        columns: Column names to populate.
+    """
+    async with engine.begin() as conn:
+        if _is_sqlite:
+            target = table(table_name, *(column(name) for name in columns))
+            await conn.execute(
+                insert(target), [dict(zip(columns, row)) for row in records],
+            )
+            return
+
+        raw = await conn.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            table_name, records=records, columns=list(columns),
+        )
@@ -14,10 +14,11 @@ def setup_logging(log_level: str = "INFO") -> None:
     Args:
         log_level: Python log level name (DEBUG, INFO, WARNING, etc.).
     """
+    level = getattr(logging, log_level.upper(), logging.INFO)
+
     structlog.configure(
         processors=[
             structlog.contextvars.merge_contextvars,
-            structlog.stdlib.filter_by_level,
             structlog.stdlib.add_logger_name,
             structlog.stdlib.add_log_level,
             structlog.stdlib.PositionalArgumentsFormatter(),
@@ -26,7 +27,8 @@ def setup_logging(log_level: str = "INFO") -> None:
             structlog.processors.UnicodeDecoder(),
             structlog.processors.JSONRenderer(),
         ],
-        wrapper_class=structlog.stdlib.BoundLogger,
+        # Calls below `level` return immediately, before any processor runs
+        wrapper_class=structlog.make_filtering_bound_logger(level),
         context_class=dict,
         logger_factory=structlog.stdlib.LoggerFactory(),
         cache_logger_on_first_use=True,
@@ -35,10 +37,10 @@ def setup_logging(log_level: str = "INFO") -> None:
     logging.basicConfig(
         format="%(message)s",
         stream=sys.stdout,
-        level=getattr(logging, log_level.upper(), logging.INFO),
+        level=level,
     )
 
 
-def get_logger(name: str = "riskforge") -> structlog.stdlib.BoundLogger:
+def get_logger(name: str = "riskforge") -> structlog.typing.FilteringBoundLogger:
     """Return a named structured logger instance."""
     return structlog.get_logger(name)
@@ -5,10 +5,13 @@ Redis is optional for local development — if unavailable, the system
 continues to work without caching or rate limiting.
 """
 
-from collections.abc import AsyncGenerator
+from typing import Any
 
+import msgpack
 import redis.asyncio as aioredis
 import structlog
+import zstandard
+from redis.commands.core import AsyncScript
 
 from app.core.config import settings
 
@@ -16,38 +19,82 @@ logger = structlog.get_logger("redis")
 
 redis_pool: aioredis.Redis | None = None
 
+# INCR a counter and set its TTL on the first hit, atomically and in one round trip.
+# KEYS[1] = counter key, ARGV[1] = window in seconds. Returns the new count.
+_INCR_WITH_TTL_LUA = """
+local current = redis.call('INCR', KEYS[1])
+if current == 1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+end
+return current
+"""
+
+incr_with_ttl: AsyncScript | None = None
+
+# Cached payloads shared with the risk-service are zstd-compressed msgpack.
+# Level 1 keeps compression cheap; the win is smaller values on the wire.
+_zstd_compressor = zstandard.ZstdCompressor(level=1)
+_zstd_decompressor = zstandard.ZstdDecompressor()
+
+
+def pack_cache_value(data: dict[str, Any]) -> bytes:
+    """Encode a JSON-compatible dict for storage in Redis."""
+    return _zstd_compressor.compress(msgpack.packb(data))
+
+
+def unpack_cache_value(raw: bytes) -> dict[str, Any]:
+    """Decode a value written by :func:`pack_cache_value` or the risk-service.
+
+    The worker packs datetimes as msgpack Timestamps and UUIDs as raw bytes;
+    ``timestamp=3`` turns the former back into tz-aware datetimes, and
+    pydantic validates both straight into the response schema.
+    """
+    return msgpack.unpackb(_zstd_decompressor.decompress(raw), timestamp=3)
+
 
 async def init_redis() -> aioredis.Redis | None:
     """Initialise the module-level Redis connection pool.
 
     Returns None and logs a warning if Redis is unreachable (local dev).
     """
-    global redis_pool  # noqa: PLW0603
+    global redis_pool, incr_with_ttl  # noqa: PLW0603
     try:
         pool = aioredis.from_url(
             settings.redis_url,
-            decode_responses=True,
+            # Raw bytes: cached values are binary, and JSON/ints need no decode step
+            decode_responses=False,
             max_connections=50,
         )
         await pool.ping()  # verify connectivity
+        # SCRIPT LOAD up front so requests go straight to EVALSHA
+        script = pool.register_script(_INCR_WITH_TTL_LUA)
+        script.sha = await pool.script_load(_INCR_WITH_TTL_LUA)
         redis_pool = pool
+        incr_with_ttl = script
         logger.info("redis_connected", url=settings.redis_url)
         return redis_pool
     except Exception as exc:
         logger.warning("redis_unavailable", error=str(exc), msg="Running without Redis")
         redis_pool = None
+        incr_with_ttl = None
         return None
 
 
 async def close_redis() -> None:
     """Close the Redis connection pool gracefully."""
-    global redis_pool  # noqa: PLW0603
+    global redis_pool, incr_with_ttl  # noqa: PLW0603
     if redis_pool:
         await redis_pool.aclose()
         redis_pool = None
+        incr_with_ttl = None
+
 
+async def get_redis() -> aioredis.Redis | None:
+    """FastAPI dependency – returns the shared Redis client (or None).
 
-async def get_redis() -> AsyncGenerator[aioredis.Redis | None, None]:
-    """FastAPI dependency – yields the shared Redis client (or None)."""
-    yield redis_pool
+    A plain coroutine rather than a generator: there is nothing to clean up
+    per request, and FastAPI awaits it inline without generator setup or the
+    threadpool hop a sync ``def`` dependency would take.
+    """
+    return redis_pool
 
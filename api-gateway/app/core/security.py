@@ -3,45 +3,89 @@ JWT token handling, password hashing, and OAuth2 dependency.
 
 Provides:
 - create_access_token / decode_access_token
-- hash_password / verify_password
-- get_current_user (FastAPI dependency)
+- hash_password / verify_password / password_needs_rehash
+- get_current_user (FastAPI dependency, Redis-cached) / cache_user
 """
 
-from datetime import datetime, timedelta, timezone
+import time
+from hashlib import blake2b
 from typing import Any
 from uuid import UUID
 
 import bcrypt
-from fastapi import Depends, HTTPException, status
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+from cachetools import TTLCache
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
+import jwt
+import redis.asyncio as aioredis
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.core.database import get_db
+from app.core.logging import get_logger
+from app.core.redis import get_redis
+from app.repositories.user_repository import UserRepository
+from app.schemas.user import CurrentUser
+
+logger = get_logger("security")
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
+# Settings read on every request, bound once at import
+_JWT_KEY = settings.jwt_secret_key
+_JWT_ALG = settings.jwt_algorithm
+_JWT_ALGORITHMS = [_JWT_ALG]
+_JWT_EXP_SECONDS = settings.jwt_access_token_expire_minutes * 60
+
 
 # ── Password utilities ───────────────────────────────────────────────────────
 
+# Argon2id with the OWASP-recommended minimum parameters (19 MiB, t=2, p=1)
+_password_hasher = PasswordHasher(time_cost=2, memory_cost=19456, parallelism=1)
+
+# Prefixes used by bcrypt hashes created before the switch to Argon2id
+_BCRYPT_PREFIXES = ("$2a$", "$2b$", "$2y$")
+
+
 def hash_password(password: str) -> str:
-    """Return bcrypt hash of the given plain-text password."""
-    password_bytes = password.encode("utf-8")
-    salt = bcrypt.gensalt()
-    return bcrypt.hashpw(password_bytes, salt).decode("utf-8")
+    """Return an Argon2id hash of the given plain-text password."""
+    return _password_hasher.hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a plain-text password against its bcrypt hash."""
-    return bcrypt.checkpw(
-        plain_password.encode("utf-8"),
-        hashed_password.encode("utf-8"),
-    )
+    """Verify a plain-text password against its Argon2id (or legacy bcrypt) hash."""
+    if hashed_password.startswith(_BCRYPT_PREFIXES):
+        return bcrypt.checkpw(
+            plain_password.encode("utf-8"),
+            hashed_password.encode("utf-8"),
+        )
+    try:
+        return _password_hasher.verify(hashed_password, plain_password)
+    except (VerificationError, InvalidHashError):
+        return False
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Return True if the hash is legacy bcrypt or uses outdated Argon2 parameters."""
+    if hashed_password.startswith(_BCRYPT_PREFIXES):
+        return True
+    return _password_hasher.check_needs_rehash(hashed_password)
 
 
 # ── JWT utilities ─────────────────────────────────────────────────────────────
 
+# Verified token payloads, keyed by a short digest of the raw token. Entries live
+# at most 60 s and `exp` is re-checked on every hit, so expiry is never extended.
+_token_cache: TTLCache = TTLCache(maxsize=10_000, ttl=60)
+
+
+def _token_cache_key(token: str) -> bytes:
+    """Return a fixed-size cache key for a raw JWT string."""
+    return blake2b(token.encode("utf-8"), digest_size=16).digest()
+
+
 def create_access_token(subject: str | UUID, extra: dict[str, Any] | None = None) -> str:
     """Create a signed JWT access token.
 
@@ -52,58 +96,116 @@ def create_access_token(subject: str | UUID, extra: dict[str, Any] | None = None
     Returns:
         Encoded JWT string.
     """
-    expire = datetime.now(timezone.utc) + timedelta(minutes=settings.jwt_access_token_expire_minutes)
     payload: dict[str, Any] = {
         "sub": str(subject),
-        "exp": expire,
+        "exp": int(time.time()) + _JWT_EXP_SECONDS,  # NumericDate; no datetime round trip
         **(extra or {}),
     }
-    return jwt.encode(payload, settings.jwt_secret_key, algorithm=settings.jwt_algorithm)
+    return jwt.encode(payload, _JWT_KEY, algorithm=_JWT_ALG)
 
 
 def decode_access_token(token: str) -> dict[str, Any]:
     """Decode and validate a JWT access token.
 
+    Successfully verified payloads are cached briefly so repeated requests
+    with the same token skip the HMAC verification and JSON parsing.
+
     Raises:
         HTTPException 401 on invalid / expired token.
     """
+    key = _token_cache_key(token)
+    cached = _token_cache.get(key)
+    if cached is not None and cached.get("exp", 0) > time.time():
+        return cached
+
     try:
-        payload = jwt.decode(token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm])
-        return payload
-    except JWTError as exc:
+        payload = jwt.decode(token, _JWT_KEY, algorithms=_JWT_ALGORITHMS)
+    except jwt.InvalidTokenError as exc:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         ) from exc
 
+    _token_cache[key] = payload
+    return payload
+
 
 # ── FastAPI dependency ────────────────────────────────────────────────────────
 
+# Users rarely change, so the per-request lookup is served from Redis. Staleness
+# is bounded by the TTL.
+USER_CACHE_TTL_SECONDS = 60
+
+
+def _user_cache_key(user_id: UUID) -> bytes:
+    # Raw UUID bytes keep the key at 21 B instead of 41 B of hex text
+    return b"user:" + user_id.bytes
+
+
+async def _get_cached_user(redis: aioredis.Redis | None, user_id: UUID) -> CurrentUser | None:
+    """Return the cached user snapshot, or None on miss / Redis failure."""
+    if redis is None:
+        return None
+    try:
+        cached = await redis.get(_user_cache_key(user_id))
+    except Exception as exc:
+        logger.warning("user_cache_read_failed", error=str(exc))
+        return None
+    return CurrentUser.model_validate_json(cached) if cached else None
+
+
+async def cache_user(redis: aioredis.Redis | None, user: CurrentUser) -> None:
+    """Store a user snapshot in Redis (best effort)."""
+    if redis is None:
+        return
+    try:
+        await redis.setex(_user_cache_key(user.id), USER_CACHE_TTL_SECONDS, user.model_dump_json())
+    except Exception as exc:
+        logger.warning("user_cache_write_failed", error=str(exc))
+
+
 async def get_current_user(
+    request: Request,
     token: str = Depends(oauth2_scheme),
     db: AsyncSession = Depends(get_db),
-):
+    redis: aioredis.Redis | None = Depends(get_redis),
+) -> CurrentUser:
     """Dependency – resolves the current authenticated user from the JWT.
 
+    Reuses the payload decoded by AuthContextMiddleware when available (or
+    its rejection of the token) and serves the user row from Redis before
+    falling back to the database.
+
     Returns:
-        The User ORM instance.
+        A CurrentUser snapshot of the authenticated user.
 
     Raises:
         HTTPException 401 if token is invalid or user not found.
     """
-    from app.repositories.user_repository import UserRepository  # avoid circular import
-
-    payload = decode_access_token(token)
-    user_id: str | None = payload.get("sub")
-    if user_id is None:
+    if getattr(request.state, "jwt_rejected", False):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    payload = getattr(request.state, "jwt_payload", None) or decode_access_token(token)
+    try:
+        user_id = UUID(payload["sub"])
+    except (KeyError, TypeError, ValueError):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
         )
 
-    repo = UserRepository(db)
-    user = await repo.get_by_id(UUID(user_id))
+    user = await _get_cached_user(redis, user_id)
+    if user is None:
+        repo = UserRepository(db)
+        db_user = await repo.get_by_id(user_id)
+        if db_user is not None:
+            user = CurrentUser.model_validate(db_user)
+            await cache_user(redis, user)
+
     if user is None or not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
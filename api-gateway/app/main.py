@@ -9,13 +9,17 @@ from contextlib import asynccontextmanager
 from collections.abc import AsyncIterator
 
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 
 from app.api import auth, alerts, health, transactions
 from app.core.config import settings
 from app.core.logging import setup_logging, get_logger
 from app.core.redis import close_redis, init_redis
+from app.middleware.auth_context import AuthContextMiddleware
 from app.middleware.logging_middleware import LoggingMiddleware
 from app.middleware.rate_limiter import RateLimiterMiddleware
+from app.services.risk_dispatcher import risk_dispatcher
+from app.services.transaction_batcher import transaction_batcher
 
 logger = get_logger("main")
 
@@ -35,13 +39,39 @@ async def lifespan(application: FastAPI) -> AsyncIterator[None]:
         async with engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
         logger.info("sqlite_tables_created")
+    else:
+        # Pre-open pooled PostgreSQL connections so the first requests don't pay for them
+        from app.core.database import warm_pool
+
+        try:
+            await warm_pool()
+            logger.info("db_pool_warmed")
+        except Exception as exc:
+            logger.warning("db_pool_warm_failed", error=str(exc))
+
+    # Compile the hot repository queries before the first request needs them
+    from app.core.database import async_session_factory
+    from app.repositories.warmup import warm_query_cache
+
+    try:
+        async with async_session_factory() as session:
+            await warm_query_cache(session)
+        logger.info("query_cache_warmed")
+    except Exception as exc:
+        logger.warning("query_cache_warm_failed", error=str(exc))
 
     # Initialise Redis pool (gracefully handles connection failure)
     await init_redis()
 
+    # Batch concurrent transaction inserts and risk-task dispatch in the background
+    await transaction_batcher.start()
+    await risk_dispatcher.start()
+
     yield  # Application runs here
 
-    # Shutdown
+    # Shutdown — drain queued inserts and dispatches before the pools go away
+    await transaction_batcher.stop()
+    await risk_dispatcher.stop()
     await close_redis()
     logger.info("api_gateway_stopped")
 
@@ -51,11 +81,13 @@ app = FastAPI(
     description="Financial Risk & Fraud Detection — API Gateway Service",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
-# ── Middleware (outermost first) ──────────────────────────────────────────────
+# ── Middleware (innermost first — Starlette wraps each new one around the last)
 app.add_middleware(LoggingMiddleware)
 app.add_middleware(RateLimiterMiddleware)
+app.add_middleware(AuthContextMiddleware)  # must run before the rate limiter
 
 # ── Routers ───────────────────────────────────────────────────────────────────
 API_V1 = "/api/v1"
@@ -0,0 +1,49 @@
+"""
+Authentication context middleware.
+
+Decodes the bearer token once per request and stores the verified JWT
+payload on ``request.state.jwt_payload`` so that the rate limiter and the
+``get_current_user`` dependency don't each verify it again. A token that
+fails verification sets ``request.state.jwt_rejected`` instead, since
+invalid tokens aren't cached and would otherwise be verified twice.
+"""
+
+from typing import Any
+
+from fastapi import HTTPException
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.security import decode_access_token
+from app.middleware.bypass import is_bypassed
+
+
+class AuthContextMiddleware:
+    """Pure ASGI middleware that attaches the decoded JWT payload to the request."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # Same bypass as the rate limiter: nothing on these paths needs a user
+        if scope["type"] == "http" and not is_bypassed(scope):
+            auth_header = Headers(scope=scope).get("authorization", "")
+            if auth_header.startswith("Bearer "):
+                state = scope.setdefault("state", {})
+                payload = self._decode(auth_header.split(" ", 1)[1])
+                if payload is None:
+                    state["jwt_rejected"] = True
+                else:
+                    state["jwt_payload"] = payload
+        await self.app(scope, receive, send)
+
+    @staticmethod
+    def _decode(token: str) -> dict[str, Any] | None:
+        """Return the verified payload, or None if the token is invalid.
+
+        Invalid tokens are left for ``get_current_user`` to reject with a 401.
+        """
+        try:
+            return decode_access_token(token)
+        except HTTPException:
+            return None
@@ -0,0 +1,28 @@
+"""
+Requests the per-request middlewares leave alone.
+
+CORS preflights, probes, docs and static assets are never rate limited and
+carry no credentials worth decoding, so both the auth context and the rate
+limiter pass them straight through.
+"""
+
+from starlette.types import Scope
+
+_BYPASS_PATHS = frozenset({
+    "/health",
+    "/docs",
+    "/redoc",
+    "/openapi.json",
+    "/favicon.ico",
+})
+_BYPASS_PREFIXES = ("/docs/", "/static/")
+
+
+def is_bypassed(scope: Scope) -> bool:
+    """Return True for preflights, probes, docs and static assets."""
+    path = scope["path"]
+    return (
+        scope["method"] == "OPTIONS"
+        or path in _BYPASS_PATHS
+        or path.startswith(_BYPASS_PREFIXES)
+    )
@@ -28,7 +28,7 @@ class LoggingMiddleware(BaseHTTPMiddleware):
         logger.info(
             "http_request",
             method=request.method,
-            path=str(request.url.path),
+            path=request.scope["path"],  # avoids building a URL object per request
             status_code=response.status_code,
             duration_ms=duration_ms,
             client_ip=request.client.host if request.client else "unknown",
@@ -5,61 +5,92 @@ Tracks requests per authenticated user (or per IP for anonymous callers)
 using a Redis key with TTL. Returns HTTP 429 when the limit is exceeded.
 """
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+import orjson
+from fastapi import Request
+from starlette.types import ASGIApp, Receive, Scope, Send
 
+from app.core import redis as redis_core
 from app.core.config import settings
 from app.core.logging import get_logger
-from app.core.redis import redis_pool
+from app.core.security import decode_access_token
+from app.middleware.bypass import is_bypassed
 
 logger = get_logger("rate_limiter")
 
+WINDOW_SECONDS = 60  # 1-minute window
+_LIMIT = settings.rate_limit_per_minute
 
-class RateLimiterMiddleware(BaseHTTPMiddleware):
-    """Sliding-window rate limiter backed by Redis."""
+# The 429 response is fully pre-built and sent as raw ASGI messages
+_RATE_LIMITED_BODY = orjson.dumps({"detail": "Rate limit exceeded. Try again later."})
+_RATE_LIMITED_START = {
+    "type": "http.response.start",
+    "status": 429,
+    "headers": [
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(_RATE_LIMITED_BODY)).encode("latin-1")),
+    ],
+}
+_RATE_LIMITED_BODY_MESSAGE = {"type": "http.response.body", "body": _RATE_LIMITED_BODY}
 
-    async def dispatch(
-        self, request: Request, call_next: RequestResponseEndpoint
-    ) -> Response:
-        # Skip rate limiting if Redis isn't available or for health checks
-        if redis_pool is None or request.url.path in ("/health", "/docs", "/openapi.json"):
-            return await call_next(request)
+
+class RateLimiterMiddleware:
+    """Sliding-window rate limiter backed by Redis (pure ASGI middleware)."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # Skip CORS preflights, probes and docs before touching headers or Redis
+        if is_bypassed(scope):
+            await self.app(scope, receive, send)
+            return
+
+        # Skip rate limiting if Redis isn't available
+        # (read through the module: the pool is only created in the app lifespan)
+        incr_with_ttl = redis_core.incr_with_ttl
+        if incr_with_ttl is None:
+            await self.app(scope, receive, send)
+            return
 
         # Identify the caller
-        identifier = self._get_identifier(request)
+        identifier = self._get_identifier(Request(scope))
         key = f"rate_limit:{identifier}"
 
         try:
-            current = await redis_pool.incr(key)
-            if current == 1:
-                await redis_pool.expire(key, 60)  # 1-minute window
+            current = await incr_with_ttl(keys=[key], args=[WINDOW_SECONDS])
 
-            if current > settings.rate_limit_per_minute:
+            if current > _LIMIT:
                 logger.warning("rate_limit_exceeded", identifier=identifier, count=current)
-                return Response(
-                    content='{"detail":"Rate limit exceeded. Try again later."}',
-                    status_code=429,
-                    media_type="application/json",
-                )
+                await send(_RATE_LIMITED_START)
+                await send(_RATE_LIMITED_BODY_MESSAGE)
+                return
         except Exception:
             # Fail-open: if Redis is down, allow the request
             logger.error("rate_limiter_redis_error", exc_info=True)
 
-        response = await call_next(request)
-        return response
+        await self.app(scope, receive, send)
 
     @staticmethod
     def _get_identifier(request: Request) -> str:
         """Extract a rate-limit key from the request.
 
         Uses the JWT subject (user id) if an Authorization header is present,
-        otherwise falls back to the client IP.
+        otherwise falls back to the client IP. Prefers the payload already
+        decoded by AuthContextMiddleware, and skips tokens it rejected.
         """
+        payload = getattr(request.state, "jwt_payload", None)
+        if payload is not None:
+            return payload.get("sub", request.client.host if request.client else "unknown")
+        if getattr(request.state, "jwt_rejected", False):
+            return request.client.host if request.client else "unknown"
+
         auth_header = request.headers.get("authorization", "")
         if auth_header.startswith("Bearer "):
             try:
-                from app.core.security import decode_access_token
-
                 token = auth_header.split(" ", 1)[1]
                 payload = decode_access_token(token)
                 return payload.get("sub", request.client.host if request.client else "unknown")
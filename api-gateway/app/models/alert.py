@@ -3,8 +3,9 @@ Alert ORM model.
 """
 
 import uuid
+from datetime import datetime
 
-from sqlalchemy import Boolean, ForeignKey, String, Text
+from sqlalchemy import Boolean, DateTime, ForeignKeyConstraint, Index, String, Text, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -18,16 +19,43 @@ class Alert(UUIDMixin, TimestampMixin, Base):
 
     transaction_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
-        ForeignKey("transactions.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
+    )
+    # Parent's partition key — required by the composite foreign key
+    transaction_created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
     )
     alert_type: Mapped[str] = mapped_column(String(64), nullable=False)
     message: Mapped[str] = mapped_column(Text, nullable=False)
     resolved: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
 
     # Relationships
-    transaction = relationship("Transaction", back_populates="alerts")
+    transaction = relationship("Transaction", back_populates="alerts", lazy="raise")
+
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["transaction_id", "transaction_created_at"],
+            ["transactions.id", "transactions.created_at"],
+            ondelete="CASCADE",
+        ),
+        # One alert per transaction and type, so a rescored transaction is not
+        # alerted twice; also serves lookups by transaction_id
+        Index(
+            "uq_alerts_transaction_alert_type",
+            "transaction_id",
+            "transaction_created_at",
+            "alert_type",
+            unique=True,
+        ),
+        # Serves list_unresolved without touching resolved alerts; the predicate
+        # matches the query's `resolved IS false` so the planner can use it
+        Index(
+            "ix_alerts_unresolved_created",
+            text("created_at DESC"),
+            postgresql_where=text("resolved IS false"),
+        ),
+    )
 
     def __repr__(self) -> str:
         return f"<Alert {self.id} type={self.alert_type} resolved={self.resolved}>"
@@ -2,12 +2,17 @@
 SQLAlchemy 2.0 declarative base and common mixins.
 """
 
+import enum
 import uuid
+from decimal import ROUND_HALF_UP, Decimal
 from datetime import datetime, timezone
+from typing import Any
 
-from sqlalchemy import DateTime, func
+from sqlalchemy import BigInteger, DateTime, SmallInteger, func
 from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.types import TypeDecorator
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from uuid6 import uuid7
 
 
 class Base(DeclarativeBase):
@@ -15,19 +20,77 @@ class Base(DeclarativeBase):
     pass
 
 
+class SmallIntEnum(TypeDecorator):
+    """Persist a Python Enum as a SMALLINT code — its declaration index.
+
+    The application keeps working with enum members (or their values); only
+    the column stores the 2-byte code. Members must only ever be appended.
+    """
+
+    impl = SmallInteger
+    cache_ok = True
+
+    def __init__(self, enum_class: type[enum.Enum]) -> None:
+        super().__init__()
+        self.enum_class = enum_class
+        self._members = list(enum_class)
+        self._codes = {member: code for code, member in enumerate(self._members)}
+
+    def process_bind_param(self, value: Any, dialect: Any) -> int | None:
+        if value is None:
+            return None
+        return self._codes[self.enum_class(value)]
+
+    def process_result_value(self, value: int | None, dialect: Any) -> enum.Enum | None:
+        if value is None:
+            return None
+        return self._members[value]
+
+
+class Cents(TypeDecorator):
+    """Persist a currency amount as BIGINT minor units (cents).
+
+    Callers pass and receive plain floats; rounding to the cent happens once,
+    half-up, at the bind boundary. Fixed-width integers skip NUMERIC decoding
+    into ``Decimal`` on every fetch.
+    """
+
+    impl = BigInteger
+    cache_ok = True
+
+    def process_bind_param(self, value: Any, dialect: Any) -> int | None:
+        if value is None:
+            return None
+        return int((Decimal(str(value)) * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+    def process_result_value(self, value: int | None, dialect: Any) -> float | None:
+        if value is None:
+            return None
+        return value / 100
+
+
 class UUIDMixin:
-    """Mixin that adds a UUID primary key column."""
+    """Mixin that adds a UUID primary key column (indexed by the PK constraint itself).
+
+    Keys are time-ordered UUIDv7 values, so inserts append to the right edge
+    of the primary-key btree instead of splitting random pages.
+    """
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
-        default=uuid.uuid4,
-        index=True,
+        default=uuid7,
     )
 
 
 class TimestampMixin:
-    """Mixin that adds created_at and updated_at columns."""
+    """Mixin that adds created_at and updated_at columns.
+
+    Server-generated values are fetched via RETURNING as part of the flush,
+    so new rows never need a follow-up SELECT (or an async lazy load).
+    """
+
+    __mapper_args__ = {"eager_defaults": True}
 
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
@@ -4,17 +4,17 @@ Transaction ORM model.
 
 import enum
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 
-from sqlalchemy import DateTime, Enum, Float, ForeignKey, Index, Numeric, String
+from sqlalchemy import DateTime, Float, ForeignKey, Index, String, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.models.base import Base, TimestampMixin, UUIDMixin
+from app.models.base import Base, Cents, SmallIntEnum, TimestampMixin, UUIDMixin
 
 
 class TransactionStatus(str, enum.Enum):
-    """Lifecycle status of a financial transaction."""
+    """Lifecycle status of a financial transaction (stored as SMALLINT — append only)."""
     PENDING = "PENDING"
     APPROVED = "APPROVED"
     FLAGGED = "FLAGGED"
@@ -22,7 +22,7 @@ class TransactionStatus(str, enum.Enum):
 
 
 class RiskLevel(str, enum.Enum):
-    """Risk classification after scoring."""
+    """Risk classification after scoring (stored as SMALLINT — append only)."""
     LOW = "LOW"
     MEDIUM = "MEDIUM"
     HIGH = "HIGH"
@@ -37,11 +37,10 @@ class Transaction(UUIDMixin, TimestampMixin, Base):
         UUID(as_uuid=True),
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
 
     # Transaction details
-    amount: Mapped[float] = mapped_column(Numeric(precision=18, scale=2), nullable=False)
+    amount: Mapped[float] = mapped_column(Cents, nullable=False)
     currency: Mapped[str] = mapped_column(String(3), default="USD", nullable=False)
     location: Mapped[str | None] = mapped_column(String(256), nullable=True)
     device_id: Mapped[str | None] = mapped_column(String(128), nullable=True)
@@ -52,7 +51,7 @@ class Transaction(UUIDMixin, TimestampMixin, Base):
 
     # Scoring fields (populated by risk-service)
     status: Mapped[TransactionStatus] = mapped_column(
-        Enum(TransactionStatus, name="transaction_status", create_constraint=True),
+        SmallIntEnum(TransactionStatus),
         default=TransactionStatus.PENDING,
         nullable=False,
     )
@@ -60,15 +59,27 @@ class Transaction(UUIDMixin, TimestampMixin, Base):
     ml_score: Mapped[float | None] = mapped_column(Float, nullable=True)
     final_score: Mapped[float | None] = mapped_column(Float, nullable=True)
     risk_level: Mapped[RiskLevel | None] = mapped_column(
-        Enum(RiskLevel, name="risk_level", create_constraint=True),
+        SmallIntEnum(RiskLevel),
         nullable=True,
     )
 
-    # Relationships
-    user = relationship("User", back_populates="transactions")
-    alerts = relationship("Alert", back_populates="transaction", lazy="selectin")
+    # Partition key (monthly RANGE partitions), hence part of the primary key.
+    # Set client-side so the full identity is known without a RETURNING round trip.
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        primary_key=True,
+        default=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
+        nullable=False,
+    )
+
+    # Relationships — never loaded implicitly; opt in with selectinload() at the query site
+    user = relationship("User", back_populates="transactions", lazy="raise")
+    alerts = relationship(
+        "Alert", back_populates="transaction", lazy="raise", passive_deletes=True,
+    )
 
-    # Indexes
+    # Indexes — the composite also serves plain user_id lookups
     __table_args__ = (
         Index("ix_transactions_user_id_created", "user_id", "created_at"),
         Index("ix_transactions_status", "status"),
@@ -4,14 +4,14 @@ User ORM model.
 
 import enum
 
-from sqlalchemy import Boolean, Enum, String
+from sqlalchemy import Boolean, Index, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.models.base import Base, TimestampMixin, UUIDMixin
+from app.models.base import Base, SmallIntEnum, TimestampMixin, UUIDMixin
 
 
 class UserRole(str, enum.Enum):
-    """Allowed user roles."""
+    """Allowed user roles (stored as SMALLINT — append only)."""
     USER = "USER"
     ADMIN = "ADMIN"
 
@@ -21,19 +21,31 @@ class User(UUIDMixin, TimestampMixin, Base):
 
     __tablename__ = "users"
 
-    email: Mapped[str] = mapped_column(
-        String(320), unique=True, index=True, nullable=False,
-    )
+    email: Mapped[str] = mapped_column(String(320), nullable=False)
     hashed_password: Mapped[str] = mapped_column(String(256), nullable=False)
     role: Mapped[UserRole] = mapped_column(
-        Enum(UserRole, name="user_role", create_constraint=True),
+        SmallIntEnum(UserRole),
         default=UserRole.USER,
         nullable=False,
     )
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
 
-    # Relationships
-    transactions = relationship("Transaction", back_populates="user", lazy="selectin")
+    # Relationships — never loaded implicitly; opt in with selectinload() at the query site
+    transactions = relationship(
+        "Transaction", back_populates="user", lazy="raise", passive_deletes=True,
+    )
+
+    # Unique lookup key for login; INCLUDE makes it covering (index-only scan)
+    __table_args__ = (
+        Index(
+            "ix_users_email",
+            "email",
+            unique=True,
+            postgresql_include=[
+                "id", "hashed_password", "role", "is_active", "created_at", "updated_at",
+            ],
+        ),
+    )
 
     def __repr__(self) -> str:
         return f"<User {self.email} role={self.role.value}>"
@@ -2,12 +2,15 @@
 Alert repository — async data-access layer for the alerts table.
 """
 
+from datetime import datetime
+from typing import Any
 from uuid import UUID
 
-from sqlalchemy import func, select, update
+from sqlalchemy import insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.alert import Alert
+from app.repositories.pagination import fetch_page
 
 
 class AlertRepository:
@@ -20,20 +23,40 @@ class AlertRepository:
         self,
         *,
         transaction_id: UUID,
+        transaction_created_at: datetime,
         alert_type: str,
         message: str,
     ) -> Alert:
         """Insert a new alert and return the ORM instance."""
         alert = Alert(
             transaction_id=transaction_id,
+            transaction_created_at=transaction_created_at,
             alert_type=alert_type,
             message=message,
         )
         self._db.add(alert)
-        await self._db.flush()
-        await self._db.refresh(alert)
+        await self._db.flush()  # INSERT … RETURNING fills server defaults
         return alert
 
+    async def create_many(self, rows: list[dict[str, Any]]) -> list[Alert]:
+        """Insert a burst of alerts in one multi-row INSERT … RETURNING.
+
+        Each row needs ``transaction_id``, ``transaction_created_at``,
+        ``alert_type`` and ``message``; defaults are filled per row.
+
+        Raises:
+            IntegrityError if a row repeats the transaction and alert type of
+            an existing alert (``uq_alerts_transaction_alert_type``). There is
+            no ON CONFLICT DO NOTHING here: RETURNING rows are matched back to
+            the input order, which a skipped row would break.
+        """
+        if not rows:
+            return []
+        result = await self._db.scalars(
+            insert(Alert).returning(Alert, sort_by_parameter_order=True), rows,
+        )
+        return list(result.all())
+
     async def get_by_transaction(self, txn_id: UUID) -> list[Alert]:
         """Return all alerts for a specific transaction."""
         result = await self._db.execute(
@@ -45,17 +68,13 @@ class AlertRepository:
         self, *, skip: int = 0, limit: int = 50
     ) -> tuple[list[Alert], int]:
         """Return paginated list of unresolved alerts with total count."""
-        base = select(Alert).where(Alert.resolved.is_(False))
-
-        count_result = await self._db.execute(
-            select(func.count()).select_from(base.subquery())
-        )
-        total = count_result.scalar_one()
-
-        rows = await self._db.execute(
-            base.order_by(Alert.created_at.desc()).offset(skip).limit(limit)
+        return await fetch_page(
+            self._db,
+            select(Alert).where(Alert.resolved.is_(False)),
+            order_by=(Alert.created_at.desc(),),
+            skip=skip,
+            limit=limit,
         )
-        return list(rows.scalars().all()), total
 
     async def resolve(self, alert_id: UUID) -> bool:
         """Mark an alert as resolved. Returns True if the alert existed."""
@@ -63,6 +82,6 @@ class AlertRepository:
             update(Alert)
             .where(Alert.id == alert_id)
             .values(resolved=True)
+            .returning(Alert.id)
         )
-        await self._db.flush()
-        return result.rowcount > 0
+        return result.scalar_one_or_none() is not None
@@ -0,0 +1,39 @@
+"""
+Shared pagination helper for repository list queries.
+"""
+
+from collections.abc import Sequence
+from typing import Any
+
+from sqlalchemy import Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+async def fetch_page(
+    db: AsyncSession,
+    stmt: Select,
+    *,
+    order_by: Sequence[Any],
+    skip: int,
+    limit: int,
+) -> tuple[list[Any], int]:
+    """Return one page of ``stmt``'s entities plus the unpaginated total.
+
+    The total rides along as ``COUNT(*) OVER ()`` so page and count come back
+    in a single query. Only a page past the end (no rows, ``skip > 0``) needs
+    a separate COUNT, since there is no row to carry the total.
+    """
+    rows = (
+        await db.execute(
+            stmt.add_columns(func.count().over().label("total"))
+            .order_by(*order_by)
+            .offset(skip)
+            .limit(limit)
+        )
+    ).all()
+    if rows:
+        return [row[0] for row in rows], rows[0].total
+    if skip == 0:
+        return [], 0
+    total = await db.scalar(select(func.count()).select_from(stmt.subquery()))
+    return [], total or 0
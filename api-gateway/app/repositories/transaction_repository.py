@@ -2,12 +2,22 @@
 Transaction repository — async data-access layer for the transactions table.
 """
 
+from datetime import datetime
+from typing import Any
 from uuid import UUID
 
-from sqlalchemy import func, select, update
+from sqlalchemy import Row, func, insert, select, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
 from app.models.transaction import RiskLevel, Transaction, TransactionStatus
+from app.repositories.pagination import fetch_page
+
+# Read-only lookups select plain columns — no ORM instance or identity-map entry
+_TXN_COLUMNS = tuple(Transaction.__table__.columns)
+
+# Total order shared by OFFSET and keyset pages, so cursors line up with either
+_NEWEST_FIRST = (Transaction.created_at.desc(), Transaction.id.desc())
 
 
 class TransactionRepository:
@@ -20,16 +30,26 @@ class TransactionRepository:
         """Insert a new transaction and return the ORM instance."""
         txn = Transaction(**kwargs)
         self._db.add(txn)
-        await self._db.flush()
-        await self._db.refresh(txn)
+        await self._db.flush()  # INSERT … RETURNING fills server defaults
         return txn
 
-    async def get_by_id(self, txn_id: UUID) -> Transaction | None:
-        """Fetch a single transaction by primary key."""
+    async def create_many(self, rows: list[dict[str, Any]]) -> list[Transaction]:
+        """Insert many transactions in one multi-row INSERT … RETURNING.
+
+        Column defaults (id, status, created_at) are applied per row, and the
+        returned instances are fully loaded, so no refresh is needed.
+        """
+        result = await self._db.scalars(
+            insert(Transaction).returning(Transaction, sort_by_parameter_order=True), rows,
+        )
+        return list(result.all())
+
+    async def get_by_id(self, txn_id: UUID) -> Row | None:
+        """Fetch a single transaction as a read-only row (not an ORM instance)."""
         result = await self._db.execute(
-            select(Transaction).where(Transaction.id == txn_id)
+            select(*_TXN_COLUMNS).where(Transaction.id == txn_id)
         )
-        return result.scalar_one_or_none()
+        return result.one_or_none()
 
     async def list_by_user(
         self,
@@ -37,19 +57,40 @@ class TransactionRepository:
         *,
         skip: int = 0,
         limit: int = 50,
+        after: tuple[datetime, UUID] | None = None,
     ) -> tuple[list[Transaction], int]:
-        """Return paginated transactions for a user and total count."""
-        base = select(Transaction).where(Transaction.user_id == user_id)
+        """Return paginated transactions for a user and total count.
 
-        count_result = await self._db.execute(
-            select(func.count()).select_from(base.subquery())
-        )
-        total = count_result.scalar_one()
+        With ``after`` (the ``(created_at, id)`` of the previous page's last
+        row) the page is fetched by keyset — an index range scan that costs
+        O(limit) however deep the page. Otherwise falls back to OFFSET ``skip``.
+        """
+        owned = Transaction.user_id == user_id
+        if after is None:
+            return await fetch_page(
+                self._db,
+                select(Transaction).where(owned),
+                order_by=_NEWEST_FIRST,
+                skip=skip,
+                limit=limit,
+            )
 
-        rows = await self._db.execute(
-            base.order_by(Transaction.created_at.desc()).offset(skip).limit(limit)
-        )
-        return list(rows.scalars().all()), total
+        counted = aliased(Transaction)
+        total_col = (
+            select(func.count()).select_from(counted).where(counted.user_id == user_id)
+        ).scalar_subquery()
+        rows = (
+            await self._db.execute(
+                select(Transaction, total_col.label("total"))
+                .where(owned, tuple_(Transaction.created_at, Transaction.id) < tuple_(*after))
+                .order_by(*_NEWEST_FIRST)
+                .limit(limit)
+            )
+        ).all()
+        if rows:
+            return [row[0] for row in rows], rows[0].total
+        total = await self._db.scalar(select(func.count()).select_from(Transaction).where(owned))
+        return [], total or 0
 
     async def update_risk_scores(
         self,
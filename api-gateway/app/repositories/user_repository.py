@@ -4,10 +4,21 @@ User repository — async data-access layer for the users table.
 
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import Row, bindparam, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.user import User
+from app.models.user import User, UserRole
+
+# Read paths select plain columns: rows skip ORM instantiation and identity-map
+# bookkeeping, and Pydantic reads them via from_attributes just the same.
+_USER_COLUMNS = tuple(User.__table__.columns)
+
+# Hot lookups built once: the SQL compile cache and asyncpg's prepared
+# statement cache then hit on every call without re-constructing the query.
+_SELECT_BY_ID = select(*_USER_COLUMNS).where(User.id == bindparam("user_id"))
+_SELECT_BY_EMAIL = select(*_USER_COLUMNS).where(User.email == bindparam("email"))
 
 
 class UserRepository:
@@ -18,27 +29,49 @@ class UserRepository:
 
     async def create(self, *, email: str, hashed_password: str, role: str = "USER") -> User:
         """Insert a new user and return the ORM instance."""
-        from app.models.user import UserRole
-
         user = User(
             email=email,
             hashed_password=hashed_password,
             role=UserRole(role),
         )
         self._db.add(user)
-        await self._db.flush()
-        await self._db.refresh(user)
+        await self._db.flush()  # INSERT … RETURNING fills server defaults
         return user
 
-    async def get_by_id(self, user_id: UUID) -> User | None:
-        """Fetch a user by primary key."""
-        result = await self._db.execute(select(User).where(User.id == user_id))
-        return result.scalar_one_or_none()
+    async def create_if_absent(
+        self, *, email: str, hashed_password: str, role: str = "USER",
+    ) -> User | None:
+        """Insert a user unless the email is taken, in one round trip.
+
+        Returns the new user, or None if a user with this email already exists.
+        Uses INSERT … ON CONFLICT (email) DO NOTHING RETURNING, so concurrent
+        registrations of the same email cannot both succeed.
+        """
+        dialect_insert = sqlite_insert if self._db.bind.dialect.name == "sqlite" else pg_insert
+        stmt = (
+            dialect_insert(User)
+            .values(email=email, hashed_password=hashed_password, role=UserRole(role))
+            .on_conflict_do_nothing(index_elements=["email"])
+            .returning(User)
+        )
+        result = await self._db.scalars(stmt)
+        return result.one_or_none()
+
+    async def get_by_id(self, user_id: UUID) -> Row | None:
+        """Fetch a user by primary key as a read-only row (not an ORM instance)."""
+        result = await self._db.execute(_SELECT_BY_ID, {"user_id": user_id})
+        return result.one_or_none()
 
-    async def get_by_email(self, email: str) -> User | None:
-        """Fetch a user by email address."""
-        result = await self._db.execute(select(User).where(User.email == email))
-        return result.scalar_one_or_none()
+    async def get_by_email(self, email: str) -> Row | None:
+        """Fetch a user by email address as a read-only row (not an ORM instance)."""
+        result = await self._db.execute(_SELECT_BY_EMAIL, {"email": email})
+        return result.one_or_none()
+
+    async def update_password_hash(self, user_id: UUID, hashed_password: str) -> None:
+        """Replace a user's stored password hash."""
+        await self._db.execute(
+            update(User).where(User.id == user_id).values(hashed_password=hashed_password)
+        )
 
     async def list_users(self, *, skip: int = 0, limit: int = 50) -> list[User]:
         """Return a paginated list of users."""
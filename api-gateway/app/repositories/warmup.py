@@ -0,0 +1,34 @@
+"""
+Startup warm-up for SQLAlchemy's compiled-statement cache.
+
+Runs each hot repository query once with parameters that match nothing, so
+the first real request doesn't pay for SQL compilation.
+"""
+
+from datetime import datetime, timezone
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.repositories.alert_repository import AlertRepository
+from app.repositories.transaction_repository import TransactionRepository
+from app.repositories.user_repository import UserRepository
+
+_NIL = UUID(int=0)
+
+
+async def warm_query_cache(session: AsyncSession) -> None:
+    """Compile (and on PostgreSQL, prepare) the read queries behind every endpoint."""
+    users = UserRepository(session)
+    await users.get_by_email("")
+    await users.get_by_id(_NIL)
+
+    txns = TransactionRepository(session)
+    await txns.get_by_id(_NIL)
+    await txns.list_by_user(_NIL)
+    await txns.list_by_user(_NIL, skip=1)  # empty page → separate COUNT
+    await txns.list_by_user(_NIL, after=(datetime.now(timezone.utc), _NIL))
+
+    alerts = AlertRepository(session)
+    await alerts.list_unresolved()
+    await alerts.get_by_transaction(_NIL)
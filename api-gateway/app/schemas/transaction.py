@@ -46,3 +46,7 @@ class TransactionList(BaseModel):
     """Paginated list of transactions."""
     total: int
     items: list[TransactionResponse]
+    next_cursor: str | None = Field(
+        default=None,
+        description="Opaque cursor for the next page; null on the last page.",
+    )
@@ -7,6 +7,8 @@ from uuid import UUID
 
 from pydantic import BaseModel, EmailStr, Field
 
+from app.models.user import UserRole
+
 
 # ── Requests ──────────────────────────────────────────────────────────────────
 
@@ -35,6 +37,17 @@ class UserResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class CurrentUser(BaseModel):
+    """Authenticated-user snapshot resolved by ``get_current_user`` (cached in Redis)."""
+    id: UUID
+    email: str
+    role: UserRole
+    is_active: bool
+    created_at: datetime
+
+    model_config = {"from_attributes": True, "frozen": True}
+
+
 class Token(BaseModel):
     """JWT token response."""
     access_token: str
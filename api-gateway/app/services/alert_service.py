@@ -1,10 +1,12 @@
 """
-Alert service — list and resolve alerts (admin operations).
+Alert service — list, bulk-create and resolve alerts (admin operations).
 """
 
+from typing import Any
 from uuid import UUID
 
 from fastapi import HTTPException, status
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.logging import get_logger
@@ -13,6 +15,9 @@ from app.schemas.alert import AlertList, AlertResponse
 
 logger = get_logger("alert_service")
 
+# Built once: validates a whole page of ORM rows in a single pydantic-core call
+_ALERT_LIST_ADAPTER = TypeAdapter(list[AlertResponse])
+
 
 class AlertService:
     """Orchestrates alert retrieval and resolution workflows."""
@@ -27,9 +32,19 @@ class AlertService:
         items, total = await self._repo.list_unresolved(skip=skip, limit=limit)
         return AlertList(
             total=total,
-            items=[AlertResponse.model_validate(a) for a in items],
+            items=_ALERT_LIST_ADAPTER.validate_python(items, from_attributes=True),
         )
 
+    async def bulk_create(self, rows: list[dict[str, Any]]) -> list[AlertResponse]:
+        """Persist several alerts with a single INSERT round trip.
+
+        Raises:
+            IntegrityError if a transaction already has an alert of that type.
+        """
+        alerts = await self._repo.create_many(rows)
+        logger.info("alerts_created", count=len(alerts))
+        return _ALERT_LIST_ADAPTER.validate_python(alerts, from_attributes=True)
+
     async def resolve_alert(self, alert_id: UUID) -> dict:
         """Mark an alert as resolved.
 
@@ -2,22 +2,59 @@
 Authentication service — registration, login, and token issuance.
 """
 
+import asyncio
+import hashlib
+import os
+from collections.abc import Callable
+from typing import TypeVar
+
+import anyio
+import redis.asyncio as aioredis
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.logging import get_logger
-from app.core.security import create_access_token, hash_password, verify_password
+from app.core.security import (
+    cache_user,
+    create_access_token,
+    hash_password,
+    password_needs_rehash,
+    verify_password,
+)
 from app.repositories.user_repository import UserRepository
-from app.schemas.user import Token, UserCreate, UserResponse
+from app.schemas.user import CurrentUser, Token, UserCreate, UserResponse
 
 logger = get_logger("auth_service")
 
+_T = TypeVar("_T")
+
+# Argon2 releases the GIL, so one hash per core runs truly in parallel. More
+# than that only queues CPU work on threads (and 19 MiB of memory per hash).
+_KDF_SLOTS = asyncio.Semaphore(os.cpu_count() or 1)
+
+
+async def _run_kdf(func: Callable[..., _T], *args: str) -> _T:
+    """Run a CPU-bound password hash/verify on the threadpool, one per core."""
+    async with _KDF_SLOTS:
+        return await anyio.to_thread.run_sync(func, *args)
+
+
+# Unknown-email tombstones: repeated logins for addresses that don't exist
+# (typos, credential stuffing) are answered from Redis instead of Postgres.
+UNKNOWN_EMAIL_TTL_SECONDS = 30
+
+
+def _unknown_email_key(email: str) -> bytes:
+    # Hashed so raw addresses from attack traffic are never stored in Redis
+    return b"noemail:" + hashlib.sha256(email.encode()).digest()[:16]
+
 
 class AuthService:
     """Orchestrates user registration and authentication workflows."""
 
-    def __init__(self, db: AsyncSession) -> None:
+    def __init__(self, db: AsyncSession, redis: aioredis.Redis | None = None) -> None:
         self._repo = UserRepository(db)
+        self._redis = redis
 
     async def register(self, payload: UserCreate) -> UserResponse:
         """Register a new user.
@@ -31,16 +68,15 @@ class AuthService:
         Raises:
             HTTPException 409 if the email is already registered.
         """
-        existing = await self._repo.get_by_email(payload.email)
-        if existing:
+        hashed = await _run_kdf(hash_password, payload.password)
+        user = await self._repo.create_if_absent(email=payload.email, hashed_password=hashed)
+        if user is None:
             logger.warning("registration_failed", email=payload.email, reason="duplicate")
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail="Email already registered",
             )
-
-        hashed = hash_password(payload.password)
-        user = await self._repo.create(email=payload.email, hashed_password=hashed)
+        await self._forget_unknown_email(payload.email)
         logger.info("user_registered", user_id=str(user.id), email=user.email)
         return UserResponse.model_validate(user)
 
@@ -57,8 +93,16 @@ class AuthService:
         Raises:
             HTTPException 401 on invalid credentials.
         """
-        user = await self._repo.get_by_email(email)
-        if not user or not verify_password(password, user.hashed_password):
+        if await self._is_unknown_email(email):
+            user = None
+        else:
+            user = await self._repo.get_by_email(email)
+            if user is None:
+                await self._remember_unknown_email(email)
+        valid = user is not None and await _run_kdf(
+            verify_password, password, user.hashed_password,
+        )
+        if not valid:
             logger.warning("login_failed", email=email)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -72,6 +116,43 @@ class AuthService:
                 detail="Account is deactivated",
             )
 
+        # Lazily migrate legacy bcrypt hashes to Argon2id on successful login
+        if password_needs_rehash(user.hashed_password):
+            await self._repo.update_password_hash(
+                user.id, await _run_kdf(hash_password, password),
+            )
+            logger.info("password_rehashed", user_id=str(user.id))
+
+        # Warm the user cache so the first authenticated request skips the DB
+        await cache_user(self._redis, CurrentUser.model_validate(user))
+
         token = create_access_token(subject=user.id, extra={"role": user.role.value})
         logger.info("login_success", user_id=str(user.id), email=user.email)
         return Token(access_token=token)
+
+    # ── Unknown-email negative cache (best effort) ────────────────────────────
+
+    async def _is_unknown_email(self, email: str) -> bool:
+        if self._redis is None:
+            return False
+        try:
+            return bool(await self._redis.get(_unknown_email_key(email)))
+        except Exception as exc:
+            logger.warning("unknown_email_cache_read_failed", error=str(exc))
+            return False
+
+    async def _remember_unknown_email(self, email: str) -> None:
+        if self._redis is None:
+            return
+        try:
+            await self._redis.setex(_unknown_email_key(email), UNKNOWN_EMAIL_TTL_SECONDS, b"1")
+        except Exception as exc:
+            logger.warning("unknown_email_cache_write_failed", error=str(exc))
+
+    async def _forget_unknown_email(self, email: str) -> None:
+        if self._redis is None:
+            return
+        try:
+            await self._redis.delete(_unknown_email_key(email))
+        except Exception as exc:
+            logger.warning("unknown_email_cache_invalidate_failed", error=str(exc))
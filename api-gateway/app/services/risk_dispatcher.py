@@ -0,0 +1,90 @@
+"""
+Risk dispatcher — enqueue risk-evaluation tasks off the request path.
+
+Celery's ``send_task`` is blocking broker I/O. Requests drop the transaction
+ID on an in-process queue instead; a background task publishes whatever has
+accumulated (up to ``max_batch`` IDs) on the threadpool as a single
+``evaluate_transactions`` message, which the worker scores with one model call.
+"""
+
+import asyncio
+
+import anyio
+
+from app.core.celery_app import celery_app
+from app.core.logging import get_logger
+
+logger = get_logger("risk_dispatcher")
+
+RISK_TASK_NAME = "app.tasks.risk_tasks.evaluate_transaction"
+RISK_BATCH_TASK_NAME = "app.tasks.risk_tasks.evaluate_transactions"
+RISK_QUEUE = "risk_queue"
+MAX_BATCH_SIZE = 64  # IDs per message — one predict_proba call on the worker
+
+_STOP = None  # queue sentinel that ends the publish loop
+
+
+def send_risk_tasks(txn_ids: list[str]) -> None:
+    """Publish one batch evaluation task covering every ID (blocking)."""
+    celery_app.send_task(RISK_BATCH_TASK_NAME, args=[txn_ids], queue=RISK_QUEUE)
+
+
+class RiskDispatcher:
+    """Background publisher that batches risk-evaluation task dispatch."""
+
+    def __init__(self, *, max_batch: int = MAX_BATCH_SIZE) -> None:
+        self._max_batch = max_batch
+        self._queue: asyncio.Queue[str | None] = asyncio.Queue()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def running(self) -> bool:
+        """True once :meth:`start` has been called and until :meth:`stop`."""
+        return self._task is not None
+
+    async def start(self) -> None:
+        """Spawn the background publish task (idempotent)."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="risk-dispatcher")
+
+    async def stop(self) -> None:
+        """Publish everything queued so far, then stop the background task."""
+        if self._task is None:
+            return
+        task, self._task = self._task, None
+        self._queue.put_nowait(_STOP)
+        await task
+
+    def enqueue(self, txn_id: str) -> None:
+        """Schedule a transaction for risk evaluation — no I/O on the caller's path."""
+        self._queue.put_nowait(txn_id)
+
+    async def _run(self) -> None:
+        while True:
+            item = await self._queue.get()
+            batch: list[str] = []
+            while item is not _STOP:
+                batch.append(item)
+                if len(batch) >= self._max_batch:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+            if batch:
+                await self._publish(batch)
+            if item is _STOP:
+                return
+
+    async def _publish(self, batch: list[str]) -> None:
+        try:
+            await anyio.to_thread.run_sync(send_risk_tasks, batch)
+        except Exception as exc:
+            logger.warning(
+                "celery_dispatch_failed", error=str(exc), size=len(batch), transaction_ids=batch,
+            )
+            return
+        logger.debug("risk_tasks_dispatched", size=len(batch))
+
+
+risk_dispatcher = RiskDispatcher()
@@ -0,0 +1,108 @@
+"""
+Transaction batcher — coalesce concurrent transaction inserts into one round trip.
+
+Requests submit their row and await a future; a single background task drains
+the queue and writes up to ``max_batch`` rows per INSERT … RETURNING, so under
+load many requests share one statement and one COMMIT. Batches form naturally
+while the previous flush is in flight — an idle system pays no added latency.
+"""
+
+import asyncio
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.database import async_session_factory
+from app.core.logging import get_logger
+from app.models.transaction import Transaction
+from app.repositories.transaction_repository import TransactionRepository
+
+logger = get_logger("transaction_batcher")
+
+MAX_BATCH_SIZE = 100
+
+_Pending = tuple[dict[str, Any], asyncio.Future]
+_STOP: Any = object()  # queue sentinel that ends the flush loop
+
+
+class TransactionBatcher:
+    """Background writer that batches ``Transaction`` inserts across requests."""
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession] = async_session_factory,
+        *,
+        max_batch: int = MAX_BATCH_SIZE,
+    ) -> None:
+        self._session_factory = session_factory
+        self._max_batch = max_batch
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def running(self) -> bool:
+        """True once :meth:`start` has been called and until :meth:`stop`."""
+        return self._task is not None
+
+    async def start(self) -> None:
+        """Spawn the background flush task (idempotent)."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="transaction-batcher")
+
+    async def stop(self) -> None:
+        """Flush everything queued so far, then stop the background task."""
+        if self._task is None:
+            return
+        task, self._task = self._task, None
+        await self._queue.put(_STOP)
+        await task
+
+    async def submit(self, row: dict[str, Any]) -> Transaction:
+        """Queue a row for insertion and wait until its batch has committed."""
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        await self._queue.put((row, future))
+        return await future
+
+    async def _run(self) -> None:
+        while True:
+            item = await self._queue.get()
+            batch: list[_Pending] = []
+            # Take whatever is already waiting, up to max_batch — no linger timer
+            while item is not _STOP:
+                batch.append(item)
+                if len(batch) >= self._max_batch:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+            if batch:
+                await self._flush(batch)
+            if item is _STOP:
+                return
+
+    async def _flush(self, batch: list[_Pending]) -> None:
+        rows = [row for row, _ in batch]
+        try:
+            async with self._session_factory() as session:
+                txns = await TransactionRepository(session).create_many(rows)
+                await session.commit()
+        except Exception as exc:
+            if len(batch) > 1:
+                # Isolate the offending row instead of failing every caller
+                logger.warning("transaction_batch_failed", size=len(batch), error=str(exc))
+                for item in batch:
+                    await self._flush([item])
+                return
+            _, future = batch[0]
+            if not future.done():
+                future.set_exception(exc)
+            return
+
+        for (_, future), txn in zip(batch, txns):
+            if not future.done():  # the submitter may have been cancelled
+                future.set_result(txn)
+        logger.debug("transaction_batch_flushed", size=len(batch))
+
+
+transaction_batcher = TransactionBatcher()
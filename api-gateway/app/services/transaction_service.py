@@ -2,23 +2,38 @@
 Transaction service — create transactions, check cache, and enqueue risk evaluation.
 """
 
-import json
+import base64
 from datetime import datetime, timezone
 from uuid import UUID
 
 import redis.asyncio as aioredis
 from fastapi import HTTPException, status
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.celery_app import celery_app
 from app.core.logging import get_logger
+from app.core.redis import pack_cache_value, unpack_cache_value
 from app.repositories.transaction_repository import TransactionRepository
 from app.schemas.transaction import TransactionCreate, TransactionList, TransactionResponse
+from app.services.risk_dispatcher import RISK_QUEUE, RISK_TASK_NAME, risk_dispatcher
+from app.services.transaction_batcher import transaction_batcher
 
 logger = get_logger("transaction_service")
 
 CACHE_TTL_SECONDS = 600  # 10 minutes
 
+# Built once: validates a whole page of ORM rows in a single pydantic-core call
+_TXN_LIST_ADAPTER = TypeAdapter(list[TransactionResponse])
+
+
+def transaction_cache_key(txn_id: UUID) -> bytes:
+    """Redis key for a scored transaction — raw UUID bytes (20 B vs 40 B as hex text).
+
+    Shared with the risk-service worker, which writes these entries.
+    """
+    return b"txn:" + txn_id.bytes
+
 
 class TransactionService:
     """Orchestrates transaction creation, caching, and risk-evaluation dispatch."""
@@ -43,33 +58,39 @@ class TransactionService:
         """
         txn_time = payload.transaction_time or datetime.now(timezone.utc)
 
-        txn = await self._repo.create(
-            user_id=user_id,
-            amount=float(payload.amount),
-            currency=payload.currency,
-            location=payload.location,
-            device_id=payload.device_id,
-            ip_address=payload.ip_address,
-            transaction_time=txn_time,
-        )
+        row = {
+            "user_id": user_id,
+            "amount": float(payload.amount),
+            "currency": payload.currency,
+            "location": payload.location,
+            "device_id": payload.device_id,
+            "ip_address": payload.ip_address,
+            "transaction_time": txn_time,
+        }
+        # Coalesce with concurrent submissions when the batcher is running
+        if transaction_batcher.running:
+            txn = await transaction_batcher.submit(row)
+        else:
+            txn = await self._repo.create(**row)
+
+        # Celery's JSON payload needs text; encode the UUID once for it and the logs
+        txn_id = str(txn.id)
 
         # Enqueue risk evaluation to the risk-service via Celery
         # Only attempt if Redis (broker) is available to avoid blocking
-        if self._redis:
+        if self._redis and risk_dispatcher.running:
+            risk_dispatcher.enqueue(txn_id)
+        elif self._redis:
             try:
-                celery_app.send_task(
-                    "app.tasks.risk_tasks.evaluate_transaction",
-                    args=[str(txn.id)],
-                    queue="risk_queue",
-                )
+                celery_app.send_task(RISK_TASK_NAME, args=[txn_id], queue=RISK_QUEUE)
             except Exception as exc:
-                logger.warning("celery_dispatch_failed", error=str(exc), transaction_id=str(txn.id))
+                logger.warning("celery_dispatch_failed", error=str(exc), transaction_id=txn_id)
         else:
-            logger.info("skipping_risk_evaluation_no_redis", transaction_id=str(txn.id))
+            logger.info("skipping_risk_evaluation_no_redis", transaction_id=txn_id)
 
         logger.info(
             "transaction_created",
-            transaction_id=str(txn.id),
+            transaction_id=txn_id,
             user_id=str(user_id),
             amount=float(txn.amount),
         )
@@ -86,12 +107,14 @@ class TransactionService:
             TransactionResponse (from cache or DB).
         """
         # 1. Check cache
-        cache_key = f"txn_result:{txn_id}"
+        cache_key = transaction_cache_key(txn_id)
         if self._redis:
             cached = await self._redis.get(cache_key)
             if cached:
                 logger.info("cache_hit", transaction_id=str(txn_id))
-                return TransactionResponse.model_validate_json(cached)
+                response = TransactionResponse.model_validate(unpack_cache_value(cached))
+                self._check_owner(response.user_id, user_id)
+                return response
 
         # 2. DB fallback
         txn = await self._repo.get_by_id(txn_id)
@@ -100,11 +123,7 @@ class TransactionService:
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Transaction not found",
             )
-        if txn.user_id != user_id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not authorised to view this transaction",
-            )
+        self._check_owner(txn.user_id, user_id)
 
         response = TransactionResponse.model_validate(txn)
 
@@ -113,20 +132,58 @@ class TransactionService:
             await self._redis.setex(
                 cache_key,
                 CACHE_TTL_SECONDS,
-                response.model_dump_json(),
+                pack_cache_value(response.model_dump(mode="json")),
             )
 
         return response
 
+    @staticmethod
+    def _check_owner(owner_id: UUID, user_id: UUID) -> None:
+        """Raise 403 unless the transaction belongs to the requesting user."""
+        if owner_id != user_id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not authorised to view this transaction",
+            )
+
     async def list_user_transactions(
         self,
         user_id: UUID,
         skip: int = 0,
         limit: int = 50,
+        cursor: str | None = None,
     ) -> TransactionList:
-        """Return paginated transactions for the authenticated user."""
-        items, total = await self._repo.list_by_user(user_id, skip=skip, limit=limit)
+        """Return paginated transactions for the authenticated user.
+
+        Pages by keyset when ``cursor`` (a previous ``next_cursor``) is given,
+        otherwise by ``skip`` offset.
+        """
+        after = _decode_cursor(cursor) if cursor else None
+        items, total = await self._repo.list_by_user(
+            user_id, skip=skip, limit=limit, after=after,
+        )
+        next_cursor = None
+        if len(items) == limit:
+            next_cursor = _encode_cursor(items[-1].created_at, items[-1].id)
         return TransactionList(
             total=total,
-            items=[TransactionResponse.model_validate(t) for t in items],
+            items=_TXN_LIST_ADAPTER.validate_python(items, from_attributes=True),
+            next_cursor=next_cursor,
+        )
+
+
+def _encode_cursor(created_at: datetime, txn_id: UUID) -> str:
+    """Opaque keyset cursor for the row a page ended on."""
+    raw = f"{created_at.isoformat()}|{txn_id.hex}".encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        created_at, txn_id = base64.urlsafe_b64decode(cursor).decode().split("|")
+        return datetime.fromisoformat(created_at), UUID(hex=txn_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor",
         )
@@ -2,21 +2,25 @@
 Pytest configuration and shared fixtures for the API Gateway test suite.
 
 Uses an in-memory SQLite database (via aiosqlite) and mocked Redis
-to avoid external dependencies during testing.
+to avoid external dependencies during testing. The schema is created once
+per session and each test runs inside a rolled-back transaction.
 """
 
 import asyncio
 from collections.abc import AsyncGenerator
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from app.core.database import get_db
 from app.core.redis import get_redis
+from app.core.security import create_access_token, hash_password
 from app.models.base import Base
+from app.repositories.user_repository import UserRepository
 
 # Import all models so their tables are registered with Base.metadata
 from app.models.user import User  # noqa: F401
@@ -34,6 +38,28 @@ def event_loop():
     loop.close()
 
 
+# ── Cheap password hashing ───────────────────────────────────────────────────
+
+@pytest.fixture(scope="session", autouse=True)
+def fast_password_hashing():
+    """Swap in minimum-cost Argon2id parameters for the whole test session.
+
+    Tests only need hash/verify round trips, not brute-force resistance;
+    production parameters cost tens of ms and 19 MiB per hash.
+    """
+    from argon2 import PasswordHasher
+
+    from app.core import security
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(
+            security,
+            "_password_hasher",
+            PasswordHasher(time_cost=1, memory_cost=8, parallelism=1),
+        )
+        yield
+
+
 # ── In-memory async SQLite engine ─────────────────────────────────────────────
 
 TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
@@ -44,9 +70,21 @@ TestSessionFactory = async_sessionmaker(
 )
 
 
-@pytest_asyncio.fixture(autouse=True)
+# pysqlite's own transaction handling breaks SAVEPOINT; take it over so the
+# per-test rollback below works (SQLAlchemy's documented SQLite recipe)
+@event.listens_for(test_engine.sync_engine, "connect")
+def _disable_driver_transactions(dbapi_connection, _record):
+    dbapi_connection.isolation_level = None
+
+
+@event.listens_for(test_engine.sync_engine, "begin")
+def _emit_begin(conn):
+    conn.exec_driver_sql("BEGIN")
+
+
+@pytest_asyncio.fixture(scope="session", autouse=True)
 async def setup_db():
-    """Create all tables before each test and drop them after."""
+    """Create all tables once for the whole test session."""
     async with test_engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
     yield
@@ -56,9 +94,18 @@ async def setup_db():
 
 @pytest_asyncio.fixture
 async def db_session() -> AsyncGenerator[AsyncSession, None]:
-    """Yield a fresh DB session for each test."""
-    async with TestSessionFactory() as session:
-        yield session
+    """Yield a session inside a transaction that is rolled back after the test.
+
+    Commits made by the code under test only release a SAVEPOINT, so every
+    test starts from the same data without re-running DDL.
+    """
+    async with test_engine.connect() as conn:
+        await conn.begin()
+        async with AsyncSession(
+            bind=conn, expire_on_commit=False, join_transaction_mode="create_savepoint",
+        ) as session:
+            yield session
+        await conn.rollback()
 
 
 # ── Mock Redis ────────────────────────────────────────────────────────────────
@@ -75,11 +122,43 @@ def mock_redis():
     return r
 
 
+# ── Celery stub ──────────────────────────────────────────────────────────────
+
+class CelerySpy:
+    """Stands in for the Celery app: records send_task calls, sends nothing."""
+
+    def __init__(self) -> None:
+        self.calls: list[tuple[tuple, dict]] = []
+
+    def send_task(self, *args, **kwargs) -> None:
+        self.calls.append((args, kwargs))
+
+
+@pytest.fixture
+def celery_spy():
+    """Replace the transaction service's Celery app with a :class:`CelerySpy`."""
+    spy = CelerySpy()
+    with patch("app.services.transaction_service.celery_app", spy):
+        yield spy
+
+
 # ── HTTPX async test client ──────────────────────────────────────────────────
 
+@pytest_asyncio.fixture(scope="session")
+async def http_client() -> AsyncGenerator[AsyncClient, None]:
+    """One AsyncClient for the whole session; per-test state lives in `client`."""
+    from app.main import app
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        yield ac
+
+
 @pytest_asyncio.fixture
-async def client(db_session: AsyncSession, mock_redis) -> AsyncGenerator[AsyncClient, None]:
-    """Create an async test client with overridden DB and Redis dependencies."""
+async def client(
+    http_client: AsyncClient, db_session: AsyncSession, mock_redis,
+) -> AsyncGenerator[AsyncClient, None]:
+    """The shared client, with DB and Redis dependencies bound to this test."""
     from app.main import app
 
     async def _override_db():
@@ -90,9 +169,27 @@ async def client(db_session: AsyncSession, mock_redis) -> AsyncGenerator[AsyncCl
 
     app.dependency_overrides[get_db] = _override_db
     app.dependency_overrides[get_redis] = _override_redis
+    yield http_client
+    app.dependency_overrides.clear()
 
-    transport = ASGITransport(app=app)
-    async with AsyncClient(transport=transport, base_url="http://test") as ac:
-        yield ac
 
-    app.dependency_overrides.clear()
+# ── Session-wide test user ───────────────────────────────────────────────────
+
+TEST_USER_EMAIL = "session-user@example.com"
+
+
+@pytest_asyncio.fixture(scope="session")
+async def test_user(setup_db, fast_password_hashing) -> User:
+    """A user committed once, outside any per-test rollback."""
+    async with TestSessionFactory() as session:
+        user = await UserRepository(session).create(
+            email=TEST_USER_EMAIL, hashed_password=hash_password("SecureP@ss123"),
+        )
+        await session.commit()
+    return user
+
+
+@pytest.fixture(scope="session")
+def token(test_user: User) -> str:
+    """A valid JWT for :func:`test_user`, minted without a login round trip."""
+    return create_access_token(subject=test_user.id, extra={"role": test_user.role.value})
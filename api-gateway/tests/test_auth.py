@@ -3,10 +3,13 @@ Authentication endpoint tests.
 
 Covers:
     - User registration (success + duplicate email)
-    - User login (success + invalid credentials)
-    - /auth/me (token validation)
+    - User login (success + invalid credentials + unknown-email negative cache)
+    - /auth/me (token validation, verified once per request)
 """
 
+from unittest.mock import AsyncMock, patch
+from uuid import UUID
+
 import pytest
 from httpx import AsyncClient
 
@@ -77,6 +80,30 @@ async def test_login_nonexistent_user(client: AsyncClient):
     assert response.status_code == 401
 
 
+@pytest.mark.asyncio
+async def test_login_unknown_email_is_negative_cached(client: AsyncClient, mock_redis):
+    """A miss leaves a tombstone; later logins for that email skip the DB lookup."""
+    response = await client.post(
+        "/api/v1/auth/login",
+        data={"username": "nobody@example.com", "password": "any"},
+    )
+    assert response.status_code == 401
+    key, ttl, _ = mock_redis.setex.call_args.args
+    assert key.startswith(b"noemail:") and ttl == 30
+
+    mock_redis.get.side_effect = lambda k: b"1" if k == key else None
+    with patch(
+        "app.repositories.user_repository.UserRepository.get_by_email",
+        new_callable=AsyncMock,
+    ) as get_by_email:
+        response = await client.post(
+            "/api/v1/auth/login",
+            data={"username": "nobody@example.com", "password": "any"},
+        )
+    assert response.status_code == 401
+    get_by_email.assert_not_awaited()
+
+
 @pytest.mark.asyncio
 async def test_me_endpoint(client: AsyncClient):
     """/auth/me returns the current user when a valid token is supplied."""
@@ -98,8 +125,58 @@ async def test_me_endpoint(client: AsyncClient):
     assert response.json()["email"] == "eve@example.com"
 
 
+@pytest.mark.asyncio
+async def test_me_served_from_user_cache(client: AsyncClient, mock_redis):
+    """/auth/me caches the user in Redis and serves later requests from it."""
+    await client.post(
+        "/api/v1/auth/register",
+        json={"email": "frank@example.com", "password": "SecureP@ss123"},
+    )
+    login_resp = await client.post(
+        "/api/v1/auth/login",
+        data={"username": "frank@example.com", "password": "SecureP@ss123"},
+    )
+    headers = {"Authorization": f"Bearer {login_resp.json()['access_token']}"}
+    # Login already warmed the cache
+    key, _ttl, cached = mock_redis.setex.call_args.args
+    assert key.startswith(b"user:")
+
+    first = await client.get("/api/v1/auth/me", headers=headers)
+    assert key == b"user:" + UUID(first.json()["id"]).bytes
+
+    mock_redis.get.return_value = cached
+    second = await client.get("/api/v1/auth/me", headers=headers)
+    assert second.status_code == 200
+    assert second.json() == first.json()
+    mock_redis.get.assert_awaited_with(key)
+
+
 @pytest.mark.asyncio
 async def test_me_no_token(client: AsyncClient):
     """/auth/me without a token returns 401."""
     response = await client.get("/api/v1/auth/me")
     assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_me_invalid_token_is_verified_once(client: AsyncClient):
+    """A bad token rejected by the auth middleware isn't verified again by the dependency."""
+    import jwt
+
+    headers = {"Authorization": "Bearer not.a.token"}
+    with patch("app.core.security.jwt.decode", side_effect=jwt.decode) as decode:
+        response = await client.get("/api/v1/auth/me", headers=headers)
+    assert response.status_code == 401
+    assert response.headers["www-authenticate"] == "Bearer"
+    assert decode.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_bypassed_paths_skip_token_decoding(client: AsyncClient):
+    """Docs and probes pass through without the bearer token being decoded."""
+    with patch("app.core.security.decode_access_token") as decode, \
+            patch("app.middleware.auth_context.decode_access_token") as middleware_decode:
+        response = await client.get("/openapi.json", headers={"Authorization": "Bearer x.y.z"})
+    assert response.status_code == 200
+    decode.assert_not_called()
+    middleware_decode.assert_not_called()
@@ -6,24 +6,50 @@ Covers:
     - Rule engine scoring validation
     - Hybrid risk score calculation
     - Risk decision thresholds
+    - Transaction insert batching and risk-task dispatch
+    - Bulk alert inserts
+    - Decoding cache entries written by the risk-service
+    - SMALLINT enum codes stay stable
 """
 
+import asyncio
+from datetime import datetime, timezone
+
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
 
-from app.core.security import hash_password, verify_password, create_access_token, decode_access_token
+from app.core.security import (
+    create_access_token,
+    decode_access_token,
+    hash_password,
+    password_needs_rehash,
+    verify_password,
+)
 
 
 # ── Password hashing ─────────────────────────────────────────────────────────
 
 def test_hash_and_verify_password():
-    """bcrypt hash + verify round-trip."""
+    """Argon2id hash + verify round-trip."""
     plain = "MySecretPassword123"
     hashed = hash_password(plain)
     assert hashed != plain
+    assert hashed.startswith("$argon2id$")
     assert verify_password(plain, hashed) is True
     assert verify_password("wrong", hashed) is False
+    assert password_needs_rehash(hashed) is False
+
+
+def test_verify_legacy_bcrypt_password():
+    """Legacy bcrypt hashes still verify and are flagged for rehash."""
+    import bcrypt
+
+    plain = "MySecretPassword123"
+    legacy = bcrypt.hashpw(plain.encode("utf-8"), bcrypt.gensalt(rounds=4)).decode("utf-8")
+    assert verify_password(plain, legacy) is True
+    assert verify_password("wrong", legacy) is False
+    assert password_needs_rehash(legacy) is True
 
 
 # ── JWT tokens ────────────────────────────────────────────────────────────────
@@ -37,6 +63,42 @@ def test_create_and_decode_token():
     assert payload["role"] == "USER"
 
 
+def test_decode_token_is_cached():
+    """Repeated decodes of the same token are served from the cache."""
+    token = create_access_token(subject=uuid4())
+    assert decode_access_token(token) is decode_access_token(token)
+
+
+def test_decode_token_with_tampered_signature():
+    """A token whose signature was altered is rejected, not served from cache."""
+    from fastapi import HTTPException
+
+    token = create_access_token(subject=uuid4())
+    decode_access_token(token)  # cache the genuine token
+    head, body, sig = token.split(".")
+    tampered = f"{head}.{body}.{sig[:-2]}{'AA' if sig[-2:] != 'AA' else 'BB'}"
+    with pytest.raises(HTTPException) as exc_info:
+        decode_access_token(tampered)
+    assert exc_info.value.status_code == 401
+
+
+def test_decode_token_cache_never_outlives_exp():
+    """A cached payload past its exp is re-verified, not served."""
+    import time
+
+    from fastapi import HTTPException
+    import jwt
+
+    from app.core import security
+
+    payload = {"sub": str(uuid4()), "exp": int(time.time()) - 1}
+    token = jwt.encode(payload, security._JWT_KEY, algorithm=security._JWT_ALG)
+    security._token_cache[security._token_cache_key(token)] = payload
+    with pytest.raises(HTTPException) as exc_info:
+        decode_access_token(token)
+    assert exc_info.value.status_code == 401
+
+
 def test_decode_invalid_token():
     """Decoding an invalid JWT raises HTTPException."""
     from fastapi import HTTPException
@@ -63,15 +125,12 @@ def _compute_rule_score(
 
     Max possible = 80 → normalise to 0–1.
     """
-    score = 0
-    if amount > 50000:
-        score += 30
-    if hour >= 22 or hour < 6:
-        score += 10
-    if is_new_device:
-        score += 20
-    if is_unusual_location:
-        score += 20
+    score = (
+        30 * (amount > 50000)
+        + 10 * ((hour >= 22) | (hour < 6))
+        + 20 * bool(is_new_device)
+        + 20 * bool(is_unusual_location)
+    )
     return min(score / 80.0, 1.0)
 
 
@@ -152,3 +211,137 @@ def test_hybrid_edge_blocked():
     final = _hybrid_score(0.8, 0.8)
     assert final >= 0.75
     assert _risk_decision(final) == "BLOCKED"
+
+
+# ── Transaction batching ─────────────────────────────────────────────────────
+
+@pytest.mark.asyncio
+async def test_batcher_coalesces_concurrent_inserts():
+    """Concurrent submissions share one INSERT and each caller gets its own row."""
+    from app.repositories.transaction_repository import TransactionRepository
+    from app.services.transaction_batcher import TransactionBatcher
+    from tests.conftest import TestSessionFactory
+
+    batcher = TransactionBatcher(TestSessionFactory, max_batch=10)
+    user_id = uuid4()
+    rows = [
+        {"user_id": user_id, "amount": float(i), "transaction_time": datetime.now(timezone.utc)}
+        for i in range(1, 6)
+    ]
+
+    with patch.object(
+        TransactionRepository, "create_many", autospec=True,
+        side_effect=TransactionRepository.create_many,
+    ) as create_many:
+        await batcher.start()
+        txns = await asyncio.gather(*(batcher.submit(row) for row in rows))
+        await batcher.stop()
+
+    assert create_many.call_count == 1
+    assert [float(t.amount) for t in txns] == [1.0, 2.0, 3.0, 4.0, 5.0]
+    assert len({t.id for t in txns}) == 5
+    assert all(t.status.value == "PENDING" for t in txns)
+    assert not batcher.running
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_publishes_queued_ids_as_one_batch_task():
+    """Queued IDs are published together as a single batch evaluation message."""
+    from app.services.risk_dispatcher import RISK_BATCH_TASK_NAME, RiskDispatcher
+    from tests.conftest import CelerySpy
+
+    dispatcher = RiskDispatcher()
+    spy = CelerySpy()
+    with patch("app.services.risk_dispatcher.celery_app", spy):
+        for txn_id in ("a", "b", "c"):
+            dispatcher.enqueue(txn_id)
+        await dispatcher.start()
+        await dispatcher.stop()
+
+    assert len(spy.calls) == 1
+    args, kwargs = spy.calls[0]
+    assert args == (RISK_BATCH_TASK_NAME,)
+    assert kwargs["args"] == [["a", "b", "c"]]
+
+
+# ── Alert bulk insert ────────────────────────────────────────────────────────
+
+@pytest.mark.asyncio
+async def test_bulk_create_alerts_in_input_order(db_session, test_user):
+    """One INSERT … RETURNING yields the alerts in input order with defaults filled."""
+    from sqlalchemy.exc import IntegrityError
+
+    from app.repositories.transaction_repository import TransactionRepository
+    from app.services.alert_service import AlertService
+
+    now = datetime.now(timezone.utc)
+    txns = await TransactionRepository(db_session).create_many([
+        {"user_id": test_user.id, "amount": float(i), "transaction_time": now}
+        for i in range(1, 4)
+    ])
+    rows = [
+        {"transaction_id": t.id, "transaction_created_at": t.created_at,
+         "alert_type": "HIGH_RISK_TRANSACTION", "message": f"alert {i}"}
+        for i, t in enumerate(txns)
+    ]
+
+    alerts = await AlertService(db_session).bulk_create(rows)
+
+    assert [a.message for a in alerts] == ["alert 0", "alert 1", "alert 2"]
+    assert [a.transaction_id for a in alerts] == [t.id for t in txns]
+    assert len({a.id for a in alerts}) == 3
+    assert all(a.resolved is False for a in alerts)
+
+    # uq_alerts_transaction_alert_type: a repeat is an error, not a second alert
+    with pytest.raises(IntegrityError):
+        await AlertService(db_session).bulk_create(rows[:1])
+
+
+# ── Cache values ─────────────────────────────────────────────────────────────
+
+def test_unpack_worker_cache_value():
+    """Entries the worker packs with native datetimes and raw UUID bytes validate."""
+    import msgpack
+    import zstandard
+
+    from app.core.redis import unpack_cache_value
+    from app.schemas.transaction import TransactionResponse
+
+    now = datetime.now(timezone.utc)
+    txn_id, user_id = uuid4(), uuid4()
+    packed = msgpack.packb(
+        {
+            "id": txn_id.bytes, "user_id": user_id.bytes, "amount": 75.5,
+            "currency": "USD", "location": None, "device_id": None, "ip_address": None,
+            "transaction_time": now, "status": "APPROVED", "rule_score": 0.0,
+            "ml_score": 0.1, "final_score": 0.07, "risk_level": "LOW",
+            "created_at": now, "updated_at": now,
+        },
+        datetime=True,
+    )
+    raw = zstandard.ZstdCompressor(level=1).compress(packed)
+
+    response = TransactionResponse.model_validate(unpack_cache_value(raw))
+    assert (response.id, response.user_id) == (txn_id, user_id)
+    assert response.transaction_time == now
+    assert response.transaction_time.tzinfo is not None
+
+
+# ── Enum storage codes ───────────────────────────────────────────────────────
+
+def test_smallint_enum_codes_are_stable():
+    """Stored codes must never shift — migration 0004 and the risk-service rely on them."""
+    from app.models.base import SmallIntEnum
+    from app.models.transaction import RiskLevel, TransactionStatus
+    from app.models.user import UserRole
+
+    expected = {
+        TransactionStatus: ["PENDING", "APPROVED", "FLAGGED", "BLOCKED"],
+        RiskLevel: ["LOW", "MEDIUM", "HIGH"],
+        UserRole: ["USER", "ADMIN"],
+    }
+    for enum_class, labels in expected.items():
+        column_type = SmallIntEnum(enum_class)
+        for code, label in enumerate(labels):
+            assert column_type.process_bind_param(label, None) == code
+            assert column_type.process_result_value(code, None) is enum_class(label)
@@ -3,18 +3,22 @@ Transaction endpoint tests.
 
 Covers:
     - Creating a transaction (authentication required)
-    - Listing user transactions
+    - Listing user transactions (offset and keyset pages)
     - Retrieving a transaction by ID
+    - Serving a scored transaction from the Redis cache
 """
 
-from unittest.mock import patch, MagicMock
+from uuid import UUID
 
 import pytest
 from httpx import AsyncClient
 
 
-async def _register_and_login(client: AsyncClient, email: str = "txuser@example.com") -> str:
-    """Helper — register a user and return a valid JWT."""
+async def _register_and_login(client: AsyncClient, email: str) -> str:
+    """Helper — register a second user and return a valid JWT.
+
+    Most tests use the session-wide ``token`` fixture instead.
+    """
     await client.post(
         "/api/v1/auth/register",
         json={"email": email, "password": "SecureP@ss123"},
@@ -27,30 +31,27 @@ async def _register_and_login(client: AsyncClient, email: str = "txuser@example.
 
 
 @pytest.mark.asyncio
-async def test_create_transaction(client: AsyncClient):
+async def test_create_transaction(client: AsyncClient, token: str, celery_spy):
     """Authenticated users can submit a transaction."""
-    token = await _register_and_login(client)
-
-    with patch("app.services.transaction_service.celery_app") as mock_celery:
-        mock_celery.send_task = MagicMock()
-        response = await client.post(
-            "/api/v1/transactions/",
-            json={
-                "amount": 1500.00,
-                "currency": "USD",
-                "location": "New York",
-                "device_id": "device-abc",
-                "ip_address": "192.168.1.1",
-                "transaction_time": "2025-06-15T14:30:00Z",
-            },
-            headers={"Authorization": f"Bearer {token}"},
-        )
+    response = await client.post(
+        "/api/v1/transactions/",
+        json={
+            "amount": 1500.00,
+            "currency": "USD",
+            "location": "New York",
+            "device_id": "device-abc",
+            "ip_address": "192.168.1.1",
+            "transaction_time": "2025-06-15T14:30:00Z",
+        },
+        headers={"Authorization": f"Bearer {token}"},
+    )
 
     assert response.status_code == 201
     data = response.json()
     assert data["amount"] == 1500.0
     assert data["status"] == "PENDING"
     assert data["currency"] == "USD"
+    assert [call_args["args"] for _, call_args in celery_spy.calls] == [[data["id"]]]
 
 
 @pytest.mark.asyncio
@@ -64,17 +65,13 @@ async def test_create_transaction_unauthenticated(client: AsyncClient):
 
 
 @pytest.mark.asyncio
-async def test_list_transactions(client: AsyncClient):
+async def test_list_transactions(client: AsyncClient, token: str, celery_spy):
     """Users can list their own transactions."""
-    token = await _register_and_login(client, email="listuser@example.com")
-
-    with patch("app.services.transaction_service.celery_app") as mock_celery:
-        mock_celery.send_task = MagicMock()
-        await client.post(
-            "/api/v1/transactions/",
-            json={"amount": 200.0, "transaction_time": "2025-06-15T14:30:00Z"},
-            headers={"Authorization": f"Bearer {token}"},
-        )
+    await client.post(
+        "/api/v1/transactions/",
+        json={"amount": 200.0, "transaction_time": "2025-06-15T14:30:00Z"},
+        headers={"Authorization": f"Bearer {token}"},
+    )
 
     response = await client.get(
         "/api/v1/transactions/",
@@ -85,19 +82,54 @@ async def test_list_transactions(client: AsyncClient):
     assert data["total"] >= 1
     assert len(data["items"]) >= 1
 
+    # A page past the end still reports the real total
+    response = await client.get(
+        "/api/v1/transactions/?skip=10",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 200
+    assert response.json() == {"total": data["total"], "items": [], "next_cursor": None}
+
 
 @pytest.mark.asyncio
-async def test_get_transaction_by_id(client: AsyncClient):
-    """Users can retrieve their own transaction by UUID."""
-    token = await _register_and_login(client, email="getuser@example.com")
+async def test_list_transactions_keyset_cursor(client: AsyncClient, token: str, celery_spy):
+    """next_cursor walks the list newest-first without gaps or repeats."""
+    headers = {"Authorization": f"Bearer {token}"}
 
-    with patch("app.services.transaction_service.celery_app") as mock_celery:
-        mock_celery.send_task = MagicMock()
-        create_resp = await client.post(
+    created = [
+        (await client.post(
             "/api/v1/transactions/",
-            json={"amount": 500.0, "transaction_time": "2025-06-15T14:30:00Z"},
-            headers={"Authorization": f"Bearer {token}"},
-        )
+            json={"amount": amount, "transaction_time": "2025-06-15T14:30:00Z"},
+            headers=headers,
+        )).json()["id"]
+        for amount in (10.0, 20.0, 30.0)
+    ]
+
+    first = (await client.get("/api/v1/transactions/?limit=2", headers=headers)).json()
+    assert first["total"] == 3
+    assert first["next_cursor"] is not None
+
+    second = (await client.get(
+        f"/api/v1/transactions/?limit=2&cursor={first['next_cursor']}", headers=headers,
+    )).json()
+    assert second["total"] == 3
+    assert second["next_cursor"] is None
+
+    seen = [t["id"] for t in first["items"] + second["items"]]
+    assert seen == created[::-1]
+
+    bad = await client.get("/api/v1/transactions/?cursor=not-a-cursor", headers=headers)
+    assert bad.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_get_transaction_by_id(client: AsyncClient, token: str, celery_spy):
+    """Users can retrieve their own transaction by UUID."""
+    create_resp = await client.post(
+        "/api/v1/transactions/",
+        json={"amount": 500.0, "transaction_time": "2025-06-15T14:30:00Z"},
+        headers={"Authorization": f"Bearer {token}"},
+    )
     txn_id = create_resp.json()["id"]
 
     response = await client.get(
@@ -106,3 +138,37 @@ async def test_get_transaction_by_id(client: AsyncClient):
     )
     assert response.status_code == 200
     assert response.json()["id"] == txn_id
+
+
+@pytest.mark.asyncio
+async def test_get_transaction_from_cache_checks_owner(
+    client: AsyncClient, mock_redis, token: str, celery_spy,
+):
+    """Cached results are decoded from msgpack+zstd and still ownership-checked."""
+    from app.core.redis import pack_cache_value
+    from app.services.transaction_service import transaction_cache_key
+
+    owner_token = token
+    create_resp = await client.post(
+        "/api/v1/transactions/",
+        json={"amount": 750.0, "transaction_time": "2025-06-15T14:30:00Z"},
+        headers={"Authorization": f"Bearer {owner_token}"},
+    )
+    cached = {**create_resp.json(), "status": "APPROVED", "final_score": 0.12, "risk_level": "LOW"}
+    txn_key = transaction_cache_key(UUID(cached["id"]))
+    mock_redis.get.side_effect = lambda key: pack_cache_value(cached) if key == txn_key else None
+
+    response = await client.get(
+        f"/api/v1/transactions/{cached['id']}",
+        headers={"Authorization": f"Bearer {owner_token}"},
+    )
+    assert response.status_code == 200
+    assert response.json()["status"] == "APPROVED"
+    assert response.json()["final_score"] == 0.12
+
+    other_token = await _register_and_login(client, email="cacheother@example.com")
+    response = await client.get(
+        f"/api/v1/transactions/{cached['id']}",
+        headers={"Authorization": f"Bearer {other_token}"},
+    )
+    assert response.status_code == 403
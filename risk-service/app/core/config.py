@@ -24,6 +24,9 @@ class Settings(BaseSettings):
     # Celery
     celery_broker_url: str = "redis://localhost:6379/1"
     celery_result_backend: str = "redis://localhost:6379/2"
+    # Worker execution pool; the DB pool in app.tasks.risk_tasks is sized from these
+    worker_pool: str = "prefork"
+    worker_concurrency: int = 4
 
     # ML model path
     ml_model_path: str = "app/ml/model/fraud_model.joblib"
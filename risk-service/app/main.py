@@ -13,8 +13,9 @@ from collections.abc import AsyncIterator
 
 import structlog
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 
-from app.ml.predictor import load_model
+from app.services.risk_scorer import warm_up
 
 logger = structlog.get_logger("risk_service")
 
@@ -23,7 +24,7 @@ logger = structlog.get_logger("risk_service")
 async def lifespan(application: FastAPI) -> AsyncIterator[None]:
     """Startup / shutdown lifecycle."""
     logger.info("risk_service_starting")
-    load_model()
+    warm_up()
     logger.info("risk_service_ready")
     yield
     logger.info("risk_service_stopped")
@@ -34,6 +35,7 @@ app = FastAPI(
     description="ML-powered fraud risk evaluation microservice",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 
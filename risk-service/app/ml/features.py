@@ -0,0 +1,34 @@
+"""
+Model input features — one fixed-layout record per transaction.
+"""
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class RiskFeatures:
+    """The seven model inputs, declared in training column order.
+
+    Every field is required, so a missing feature is a TypeError at
+    construction rather than a silent 0 fed to the model.
+    """
+
+    amount: float
+    hour: float
+    is_night: float
+    is_new_device: float
+    is_unusual_location: float
+    amount_log: float
+    amount_zscore: float
+
+    def as_row(self) -> tuple[float, ...]:
+        """Values in model column order, ready to write into an input array."""
+        return (
+            self.amount,
+            self.hour,
+            self.is_night,
+            self.is_new_device,
+            self.is_unusual_location,
+            self.amount_log,
+            self.amount_zscore,
+        )
@@ -1,59 +1,206 @@
 """
 ML Model Predictor — loads the trained model and provides inference.
 
-The model is loaded once at module import (or startup) and reused
-for all subsequent predictions.
+The model is loaded once per process — at startup by the FastAPI lifespan,
+or on first prediction in a Celery worker process — and reused for all
+subsequent predictions. Backends are tried fastest first:
+
+1. ``fraud_model.so`` — the ensemble compiled to native code by Treelite
+2. ``fraud_model.onnx`` — ONNX Runtime's fused tree-ensemble op
+3. ``fraud_model.joblib`` — the XGBoost classifier itself (dev fallback)
 """
 
+import functools
+import json
 import os
+import threading
+from dataclasses import fields
 
 import joblib
 import numpy as np
+import onnxruntime as ort
 import structlog
+import tl2cgen
+
+from app.ml.features import RiskFeatures
 
 logger = structlog.get_logger("ml_predictor")
 
 MODEL_PATH = os.path.join(os.path.dirname(__file__), "model", "fraud_model.joblib")
+ONNX_MODEL_PATH = os.path.join(os.path.dirname(__file__), "model", "fraud_model.onnx")
+COMPILED_MODEL_PATH = os.path.join(os.path.dirname(__file__), "model", "fraud_model.so")
+FEATURE_STATS_PATH = os.path.join(os.path.dirname(__file__), "model", "feature_stats.json")
 
 _model = None
+_session: ort.InferenceSession | None = None
+_compiled: tl2cgen.Predictor | None = None
+_load_attempted = False
+
+# Training-set amount statistics; None until load_model finds feature_stats.json
+_AMT_MEAN: float | None = None
+_AMT_STD: float | None = None
+
+
+def _create_session(path: str) -> ort.InferenceSession:
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    return ort.InferenceSession(path, sess_options=options, providers=["CPUExecutionProvider"])
+
+
+def _load_feature_stats() -> None:
+    global _AMT_MEAN, _AMT_STD  # noqa: PLW0603
+    _AMT_MEAN = _AMT_STD = None
+    if not os.path.exists(FEATURE_STATS_PATH):
+        logger.warning("feature_stats_not_found", path=FEATURE_STATS_PATH)
+        return
+    with open(FEATURE_STATS_PATH) as f:
+        stats = json.load(f)
+    _AMT_MEAN, _AMT_STD = float(stats["mean_amt"]), float(stats["std_amt"])
+
+
+def amount_zscore(amount: float) -> float:
+    """Standardise an amount with the training-set mean and std (0.0 if unknown)."""
+    if _AMT_MEAN is None:
+        return 0.0
+    return (amount - _AMT_MEAN) / _AMT_STD
 
 
 def load_model() -> None:
-    """Load the serialised model from disk into module-level cache."""
-    global _model  # noqa: PLW0603
+    """Load the serialised model and its feature statistics into module-level cache."""
+    global _model, _session, _compiled, _load_attempted  # noqa: PLW0603
+    _model = _session = _compiled = None
+    _load_attempted = True
+    _cached_probability.cache_clear()  # scores from the previous model are stale
+    _load_feature_stats()
+    if os.path.exists(COMPILED_MODEL_PATH):
+        _compiled = tl2cgen.Predictor(COMPILED_MODEL_PATH)
+        logger.info("model_loaded", path=COMPILED_MODEL_PATH, runtime="tl2cgen")
+        return
+    if os.path.exists(ONNX_MODEL_PATH):
+        _session = _create_session(ONNX_MODEL_PATH)
+        logger.info("model_loaded", path=ONNX_MODEL_PATH, runtime="onnxruntime")
+        return
     if not os.path.exists(MODEL_PATH):
         logger.warning("model_not_found", path=MODEL_PATH)
-        _model = None
         return
     _model = joblib.load(MODEL_PATH)
-    logger.info("model_loaded", path=MODEL_PATH)
+    logger.info("model_loaded", path=MODEL_PATH, runtime="xgboost")
+
+
+# Column order the model was trained on (train_model.FEATURE_COLUMNS)
+FEATURE_ORDER = tuple(f.name for f in fields(RiskFeatures))
+
+
+# One reusable (1, 7) input row per thread for the single-transaction path
+_buffers = threading.local()
+
+
+def _feature_buffer() -> np.ndarray:
+    buf = getattr(_buffers, "row", None)
+    if buf is None:
+        buf = _buffers.row = np.empty((1, len(FEATURE_ORDER)), dtype=np.float32)
+    return buf
+
+
+def _onnx_binding() -> tuple[ort.IOBinding, np.ndarray]:
+    """This thread's IO binding of the ONNX session to its input row and a (1, 2) output."""
+    if getattr(_buffers, "session", None) is not _session:  # first use, or model reloaded
+        probabilities = np.empty((1, 2), dtype=np.float32)
+        binding = _session.io_binding()
+        binding.bind_cpu_input("input", _feature_buffer())
+        binding.bind_output(
+            "probabilities", "cpu", 0, np.float32, list(probabilities.shape),
+            probabilities.ctypes.data,
+        )
+        _buffers.session, _buffers.binding, _buffers.probabilities = (
+            _session, binding, probabilities,
+        )
+    return _buffers.binding, _buffers.probabilities
+
 
+def _model_loaded() -> bool:
+    # Loaded lazily so each forked worker child builds its own runtime —
+    # ONNX Runtime and tl2cgen thread pools do not survive fork()
+    if not _load_attempted:
+        load_model()
+    return _compiled is not None or _session is not None or _model is not None
 
-def predict_fraud_probability(features: dict) -> float:
+
+def _predict(X: np.ndarray) -> np.ndarray:
+    """Fraud probability per row of a float32 ``(N, 7)`` array."""
+    if _compiled is not None:
+        return _compiled.predict(tl2cgen.DMatrix(X)).ravel()
+    if _session is not None:
+        return _session.run(["probabilities"], {"input": X})[0][:, 1]
+    return _model.predict_proba(X)[:, 1]
+
+
+def predict_fraud_probability_batch(features_list: list[RiskFeatures]) -> np.ndarray:
+    """Predict fraud probabilities for many transactions in one model call.
+
+    Stacking the rows into a single ``(N, 7)`` array pays the per-call
+    XGBoost overhead once per batch instead of once per transaction.
+
+    Args:
+        features_list: One feature record per transaction.
+
+    Returns:
+        float array of length N with probabilities in 0.0 – 1.0.
+        All 0.5 if the model hasn't been loaded (safe default).
+    """
+    X = np.empty((len(features_list), len(FEATURE_ORDER)), dtype=np.float32)
+    for i, features in enumerate(features_list):
+        X[i] = features.as_row()
+    return predict_fraud_probability_matrix(X)
+
+
+def predict_fraud_probability_matrix(X: np.ndarray) -> np.ndarray:
+    """Predict fraud probabilities for a prebuilt float32 ``(N, 7)`` feature array.
+
+    Columns are in :data:`FEATURE_ORDER`. For callers that assemble the
+    features column-wise rather than as one record per transaction.
+
+    Returns:
+        float array of length N with probabilities in 0.0 – 1.0.
+        All 0.5 if the model hasn't been loaded (safe default).
+    """
+    n = X.shape[0]
+    if not _model_loaded():
+        logger.warning("model_not_loaded_returning_default")
+        return np.full(n, 0.5)
+    if n == 0:
+        return np.empty(0)
+    return _predict(X)
+
+
+def predict_fraud_probability(features: RiskFeatures) -> float:
     """Predict the fraud probability for a single transaction.
 
     Args:
-        features: dict with keys matching FEATURE_COLUMNS from training:
-            amount, hour, is_night, is_new_device, is_unusual_location,
-            amount_log, amount_zscore
+        features: The transaction's model inputs.
 
     Returns:
         Probability of fraud (0.0 – 1.0).
         Returns 0.5 if the model hasn't been loaded (safe default).
     """
-    if _model is None:
+    if not _model_loaded():
         logger.warning("model_not_loaded_returning_default")
         return 0.5
 
-    feature_order = [
-        "amount",
-        "hour",
-        "is_night",
-        "is_new_device",
-        "is_unusual_location",
-        "amount_log",
-        "amount_zscore",
-    ]
-    X = np.array([[features.get(f, 0) for f in feature_order]])
-    proba = _model.predict_proba(X)[0][1]
-    return float(proba)
+    return _cached_probability(features)
+
+
+# Real traffic repeats exact inputs (round amounts at the same hour, on the
+# same flags); those hits skip the model. Keyed on the full feature record,
+# so a cached score is always the one the model would return.
+@functools.lru_cache(maxsize=8192)
+def _cached_probability(features: RiskFeatures) -> float:
+    # Filled in place — no per-call list or ndarray allocation
+    X = _feature_buffer()
+    X[0] = features.as_row()
+    if _session is not None:
+        # Bound to X and a preallocated output, so ORT allocates neither per call
+        binding, probabilities = _onnx_binding()
+        _session.run_with_iobinding(binding)
+        return float(probabilities[0, 1])
+    return float(_predict(X)[0])
@@ -8,20 +8,25 @@ used by the Celery worker to read/update the shared PostgreSQL database.
 import enum
 import uuid
 from datetime import datetime
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Any
 
 from sqlalchemy import (
+    BigInteger,
     Boolean,
     DateTime,
-    Enum,
     Float,
-    ForeignKey,
-    Numeric,
+    ForeignKeyConstraint,
+    Index,
+    SmallInteger,
     String,
     Text,
     func,
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from sqlalchemy.types import TypeDecorator
+from uuid6 import uuid7
 
 
 class Base(DeclarativeBase):
@@ -29,6 +34,7 @@ class Base(DeclarativeBase):
 
 
 # ── Enums ─────────────────────────────────────────────────────────────────────
+# Stored as SMALLINT declaration-index codes; must match the api-gateway enums.
 
 class TransactionStatus(str, enum.Enum):
     PENDING = "PENDING"
@@ -43,6 +49,46 @@ class RiskLevel(str, enum.Enum):
     HIGH = "HIGH"
 
 
+class SmallIntEnum(TypeDecorator):
+    """Persist an Enum as its SMALLINT declaration index (mirrors api-gateway)."""
+
+    impl = SmallInteger
+    cache_ok = True
+
+    def __init__(self, enum_class: type[enum.Enum]) -> None:
+        super().__init__()
+        self.enum_class = enum_class
+        self._members = list(enum_class)
+        self._codes = {member: code for code, member in enumerate(self._members)}
+
+    def process_bind_param(self, value: Any, dialect: Any) -> int | None:
+        if value is None:
+            return None
+        return self._codes[self.enum_class(value)]
+
+    def process_result_value(self, value: int | None, dialect: Any) -> enum.Enum | None:
+        if value is None:
+            return None
+        return self._members[value]
+
+
+class Cents(TypeDecorator):
+    """Persist a currency amount as BIGINT cents, exposed as float (mirrors api-gateway)."""
+
+    impl = BigInteger
+    cache_ok = True
+
+    def process_bind_param(self, value: Any, dialect: Any) -> int | None:
+        if value is None:
+            return None
+        return int((Decimal(str(value)) * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+    def process_result_value(self, value: int | None, dialect: Any) -> float | None:
+        if value is None:
+            return None
+        return value / 100
+
+
 # ── Models ────────────────────────────────────────────────────────────────────
 
 class Transaction(Base):
@@ -50,22 +96,27 @@ class Transaction(Base):
 
     __tablename__ = "transactions"
 
-    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
-    amount: Mapped[float] = mapped_column(Numeric(precision=18, scale=2), nullable=False)
+    amount: Mapped[float] = mapped_column(Cents, nullable=False)
     currency: Mapped[str] = mapped_column(String(3), default="USD")
     location: Mapped[str | None] = mapped_column(String(256), nullable=True)
     device_id: Mapped[str | None] = mapped_column(String(128), nullable=True)
     ip_address: Mapped[str | None] = mapped_column(String(45), nullable=True)
     transaction_time: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
 
-    status: Mapped[str] = mapped_column(String(20), default="PENDING")
+    status: Mapped[TransactionStatus] = mapped_column(
+        SmallIntEnum(TransactionStatus), default=TransactionStatus.PENDING,
+    )
     rule_score: Mapped[float | None] = mapped_column(Float, nullable=True)
     ml_score: Mapped[float | None] = mapped_column(Float, nullable=True)
     final_score: Mapped[float | None] = mapped_column(Float, nullable=True)
-    risk_level: Mapped[str | None] = mapped_column(String(10), nullable=True)
+    risk_level: Mapped[RiskLevel | None] = mapped_column(SmallIntEnum(RiskLevel), nullable=True)
 
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    # Partition key — part of the (id, created_at) primary key
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), primary_key=True, server_default=func.now(),
+    )
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
 
@@ -74,14 +125,27 @@ class Alert(Base):
 
     __tablename__ = "alerts"
 
-    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    transaction_id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True),
-        ForeignKey("transactions.id", ondelete="CASCADE"),
-        nullable=False,
-    )
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid7)
+    transaction_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    transaction_created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
     alert_type: Mapped[str] = mapped_column(String(64), nullable=False)
     message: Mapped[str] = mapped_column(Text, nullable=False)
     resolved: Mapped[bool] = mapped_column(Boolean, default=False)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["transaction_id", "transaction_created_at"],
+            ["transactions.id", "transactions.created_at"],
+            ondelete="CASCADE",
+        ),
+        # Conflict target for the worker's INSERT … ON CONFLICT DO NOTHING
+        Index(
+            "uq_alerts_transaction_alert_type",
+            "transaction_id",
+            "transaction_created_at",
+            "alert_type",
+            unique=True,
+        ),
+    )
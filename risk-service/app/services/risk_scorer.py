@@ -2,10 +2,24 @@
 Risk scoring service — hybrid ML + rule-based scoring and decision logic.
 """
 
+import math
+
+import numpy as np
 import structlog
 
-from app.ml.predictor import predict_fraud_probability
-from app.services.rule_engine import compute_rule_score
+from app.ml.features import RiskFeatures
+from app.ml.predictor import (
+    FEATURE_ORDER,
+    amount_zscore,
+    load_model,
+    predict_fraud_probability,
+    predict_fraud_probability_matrix,
+)
+from app.services.rule_engine import (
+    HIGH_AMOUNT_THRESHOLD,
+    compute_rule_score_batch,
+    rule_score_from_flags,
+)
 
 logger = structlog.get_logger("risk_scorer")
 
@@ -17,6 +31,20 @@ RULE_WEIGHT = 0.3
 APPROVED_THRESHOLD = 0.4
 BLOCKED_THRESHOLD = 0.75
 
+# ── Benign fast path ─────────────────────────────────────────────────────────
+# Transactions below this amount that trigger no rule are approved without
+# consulting the model (ml_score recorded as 0.0) — the bulk of real traffic.
+BENIGN_AMOUNT_LIMIT = 1000.0
+
+# ── Decisions ────────────────────────────────────────────────────────────────
+# (status, risk_level) pairs, indexed by the number of thresholds a score
+# reaches (see determine_risk_decisions_vec). Every result shares these str
+# objects rather than allocating its own.
+DECISIONS = (("APPROVED", "LOW"), ("FLAGGED", "MEDIUM"), ("BLOCKED", "HIGH"))
+# object arrays hold references to the same strs, so indexing and tolist() copy nothing
+_STATUSES = np.array([status for status, _ in DECISIONS], dtype=object)
+_RISK_LEVELS = np.array([risk_level for _, risk_level in DECISIONS], dtype=object)
+
 
 def compute_hybrid_score(ml_score: float, rule_score: float) -> float:
     """Compute weighted hybrid risk score.
@@ -35,55 +63,58 @@ def determine_risk_decision(final_score: float) -> tuple[str, str]:
             - 0.4 ≤ score < 0.75 → (FLAGGED, MEDIUM)
             - score ≥ 0.75       → (BLOCKED, HIGH)
     """
-    if final_score < APPROVED_THRESHOLD:
-        return "APPROVED", "LOW"
-    elif final_score < BLOCKED_THRESHOLD:
-        return "FLAGGED", "MEDIUM"
-    else:
-        return "BLOCKED", "HIGH"
+    # Same indexing as determine_risk_decisions_vec
+    return DECISIONS[2 - (final_score < BLOCKED_THRESHOLD) - (final_score < APPROVED_THRESHOLD)]
 
 
-def evaluate_transaction_risk(
+def determine_risk_decisions_vec(final_scores: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Vectorised :func:`determine_risk_decision` — (statuses, risk_levels) arrays.
+
+    Branchless: the decision index starts at BLOCKED and each threshold the
+    score falls below steps it down one. Counting with ``<`` keeps a NaN
+    score BLOCKED, exactly as an if/elif cascade on ``<`` would.
+    """
+    decisions = (
+        2
+        - (final_scores < BLOCKED_THRESHOLD).astype(np.intp)
+        - (final_scores < APPROVED_THRESHOLD)
+    )
+    return _STATUSES[decisions], _RISK_LEVELS[decisions]
+
+
+def _build_features(
     *,
     amount: float,
     hour: int,
     is_new_device: bool,
     is_unusual_location: bool,
-) -> dict:
-    """Run full risk evaluation pipeline on a transaction.
-
-    Steps:
-        1. Compute ML fraud probability.
-        2. Compute rule-based score.
-        3. Compute hybrid final score.
-        4. Determine risk decision.
+) -> RiskFeatures:
+    """Model inputs for a transaction, in training-time terms.
 
-    Returns:
-        dict with ml_score, rule_score, final_score, status, risk_level.
+    The flags derived here are also what the rule score is computed from.
     """
-    import numpy as np
-
-    # Build feature dict for the ML model
-    features = {
-        "amount": amount,
-        "hour": hour,
-        "is_night": int(hour >= 22 or hour < 6),
-        "is_new_device": int(is_new_device),
-        "is_unusual_location": int(is_unusual_location),
-        "amount_log": float(np.log1p(amount)),
-        "amount_zscore": 0.0,  # Will be approximated — ideally from training set stats
-    }
-
-    ml_score = predict_fraud_probability(features)
-    rule_score = compute_rule_score(
+    return RiskFeatures(
         amount=amount,
         hour=hour,
-        is_new_device=is_new_device,
-        is_unusual_location=is_unusual_location,
+        is_night=int((hour >= 22) | (hour < 6)),
+        is_new_device=int(is_new_device),
+        is_unusual_location=int(is_unusual_location),
+        amount_log=math.log1p(amount),
+        amount_zscore=amount_zscore(amount),
     )
+
+
+def _finish_evaluation(ml_score: float, rule_score: float) -> dict:
+    """Combine the two scores and decide."""
     final_score = compute_hybrid_score(ml_score, rule_score)
     status, risk_level = determine_risk_decision(final_score)
+    return _result(ml_score, rule_score, final_score, status, risk_level)
 
+
+def _result(
+    ml_score: float, rule_score: float, final_score: float, status: str, risk_level: str,
+) -> dict:
+    """Log the outcome and return it as the stored result dict."""
     logger.info(
         "risk_evaluation_complete",
         ml_score=round(ml_score, 4),
@@ -100,3 +131,169 @@ def evaluate_transaction_risk(
         "status": status,
         "risk_level": risk_level,
     }
+
+
+def _is_benign(amount: float, rule_score: float) -> bool:
+    """True when policy approves the transaction without the ML model.
+
+    A zero rule score already rules out night hours, a new device and an
+    unusual location; the amount cap keeps the model for anything sizeable.
+    """
+    return rule_score == 0.0 and amount < BENIGN_AMOUNT_LIMIT
+
+
+def evaluate_transaction_risk(
+    *,
+    amount: float,
+    hour: int,
+    is_new_device: bool,
+    is_unusual_location: bool,
+) -> dict:
+    """Run full risk evaluation pipeline on a transaction.
+
+    Steps:
+        1. Compute rule-based score.
+        2. Compute ML fraud probability (skipped on the benign fast path).
+        3. Compute hybrid final score.
+        4. Determine risk decision.
+
+    Returns:
+        dict with ml_score, rule_score, final_score, status, risk_level.
+    """
+    # Derive the flags once; the rules and the model both read them
+    features = _build_features(
+        amount=amount,
+        hour=hour,
+        is_new_device=is_new_device,
+        is_unusual_location=is_unusual_location,
+    )
+    rule_score = rule_score_from_flags(
+        amount > HIGH_AMOUNT_THRESHOLD,
+        bool(features.is_night),
+        bool(features.is_new_device),
+        bool(features.is_unusual_location),
+    )
+    if _is_benign(amount, rule_score):
+        ml_score = 0.0
+    else:
+        ml_score = predict_fraud_probability(features)
+    return _finish_evaluation(ml_score, rule_score)
+
+
+def _feature_matrix(
+    amounts: np.ndarray,
+    hours: np.ndarray,
+    is_night: np.ndarray,
+    is_new_device: np.ndarray,
+    is_unusual_location: np.ndarray,
+) -> np.ndarray:
+    """Column-wise :func:`_build_features` — a float32 ``(N, 7)`` model input."""
+    columns = {
+        "amount": amounts,
+        "hour": hours,
+        "is_night": is_night,
+        "is_new_device": is_new_device,
+        "is_unusual_location": is_unusual_location,
+        "amount_log": np.log1p(amounts),
+        "amount_zscore": amount_zscore(amounts),
+    }
+    X = np.empty((len(amounts), len(FEATURE_ORDER)), dtype=np.float32)
+    for j, name in enumerate(FEATURE_ORDER):
+        X[:, j] = columns[name]
+    return X
+
+
+def evaluate_transactions_risk_vec(
+    amounts: np.ndarray,
+    hours: np.ndarray,
+    is_new_device: np.ndarray,
+    is_unusual_location: np.ndarray,
+) -> dict[str, np.ndarray]:
+    """Run the evaluation pipeline over arrays, with one model call.
+
+    Args:
+        amounts: float64 transaction values.
+        hours: Hours of day (0–23), any integer dtype.
+        is_new_device: bool flags.
+        is_unusual_location: bool flags.
+
+    Returns:
+        Struct of arrays, one entry per transaction: float64 ``ml_score``,
+        ``rule_score`` and ``final_score`` (unrounded), and str ``status``
+        and ``risk_level``. :func:`risk_results` turns it into result dicts.
+    """
+    rule_scores = compute_rule_score_batch(
+        amounts, hours, is_new_device, is_unusual_location,
+    ).astype(np.float64)
+
+    # Only the transactions off the benign fast path (see _is_benign) go to the model
+    ml_scores = np.zeros(len(amounts))
+    needs_model = np.flatnonzero((rule_scores != 0.0) | (amounts >= BENIGN_AMOUNT_LIMIT))
+    if needs_model.size:
+        model_hours = hours[needs_model]
+        ml_scores[needs_model] = predict_fraud_probability_matrix(_feature_matrix(
+            amounts[needs_model],
+            model_hours,
+            (model_hours >= 22) | (model_hours < 6),
+            is_new_device[needs_model],
+            is_unusual_location[needs_model],
+        ))
+
+    final_scores = ML_WEIGHT * ml_scores + RULE_WEIGHT * rule_scores
+    statuses, risk_levels = determine_risk_decisions_vec(final_scores)
+    return {
+        "ml_score": ml_scores,
+        "rule_score": rule_scores,
+        "final_score": final_scores,
+        "status": statuses,
+        "risk_level": risk_levels,
+    }
+
+
+def risk_results(scored: dict[str, np.ndarray]) -> list[dict]:
+    """Per-transaction result dicts from :func:`evaluate_transactions_risk_vec` output."""
+    return [
+        _result(*row)
+        for row in zip(*(
+            scored[key].tolist()
+            for key in ("ml_score", "rule_score", "final_score", "status", "risk_level")
+        ))
+    ]
+
+
+def evaluate_transaction_risk_batch(transactions: list[dict]) -> list[dict]:
+    """Run the evaluation pipeline on many transactions with one model call.
+
+    Args:
+        transactions: dicts with the keyword arguments of
+            :func:`evaluate_transaction_risk` (amount, hour, is_new_device,
+            is_unusual_location).
+
+    Returns:
+        One result dict per input, in the same order.
+    """
+    n = len(transactions)
+    return risk_results(evaluate_transactions_risk_vec(
+        np.fromiter((t["amount"] for t in transactions), dtype=np.float64, count=n),
+        np.fromiter((t["hour"] for t in transactions), dtype=np.int8, count=n),
+        np.fromiter((t["is_new_device"] for t in transactions), dtype=bool, count=n),
+        np.fromiter((t["is_unusual_location"] for t in transactions), dtype=bool, count=n),
+    ))
+
+
+# A transaction that trips every rule, so warm-up goes through the model
+_WARM_UP_TRANSACTION = {
+    "amount": 60_000.0, "hour": 2, "is_new_device": True, "is_unusual_location": True,
+}
+
+
+def warm_up() -> None:
+    """Load the model and run both scoring paths once.
+
+    Call at process start so the first real transaction doesn't pay for the
+    model load, the runtime's first inference, or the rule-score cache fill.
+    """
+    load_model()
+    evaluate_transaction_risk(**_WARM_UP_TRANSACTION)
+    evaluate_transaction_risk_batch([_WARM_UP_TRANSACTION])
+    logger.info("risk_scorer_warmed_up")
@@ -0,0 +1,121 @@
+"""
+Cache writer — write scored results to Redis off the task's critical path.
+
+A task has committed its results to the database before it caches them, and
+the gateway falls back to the database on a cache miss, so the Redis writes
+need not hold up the ack. Tasks drop ``(key, value)`` pairs on a bounded
+in-process queue instead (a None value deletes the key); a daemon thread drains whatever has accumulated
+(up to ``max_batch`` entries, at least every ``interval`` seconds) and
+writes it with one pipelined round trip.
+"""
+
+import queue
+import threading
+import time
+
+import redis
+import structlog
+
+logger = structlog.get_logger("cache_writer")
+
+MAX_BATCH_SIZE = 256  # entries per pipeline flush
+MAX_QUEUED = 10_000  # beyond this, entries are dropped rather than blocking tasks
+FLUSH_INTERVAL_SECONDS = 0.02
+
+_STOP = None  # queue sentinel that ends the flush loop
+
+
+def write_cache_entries(
+    client: redis.Redis, entries: list[tuple[bytes, bytes | None]], ttl: int,
+) -> None:
+    """SETEX every entry — or DEL it, if the value is None — in one round trip (blocking).
+
+    The writes are independent, so the pipeline skips MULTI/EXEC.
+    """
+    with client.pipeline(transaction=False) as pipe:
+        for key, value in entries:
+            if value is None:
+                pipe.delete(key)
+            else:
+                pipe.setex(key, ttl, value)
+        pipe.execute()
+
+
+class CacheWriter:
+    """Background thread that batches cache writes for one worker process."""
+
+    def __init__(
+        self,
+        client: redis.Redis,
+        ttl: int,
+        *,
+        max_batch: int = MAX_BATCH_SIZE,
+        max_queued: int = MAX_QUEUED,
+        interval: float = FLUSH_INTERVAL_SECONDS,
+    ) -> None:
+        self._client = client
+        self._ttl = ttl
+        self._max_batch = max_batch
+        self._interval = interval
+        self._queue: queue.Queue[tuple[bytes, bytes | None] | None] = queue.Queue(maxsize=max_queued)
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        """True once :meth:`start` has been called and until :meth:`stop`."""
+        return self._thread is not None
+
+    def start(self) -> None:
+        """Spawn the flush thread (idempotent).
+
+        Call in the process that runs tasks — after the fork for prefork
+        children, since threads don't survive it.
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="cache-writer", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Write everything queued so far, then stop the flush thread."""
+        if self._thread is None:
+            return
+        thread, self._thread = self._thread, None
+        self._queue.put(_STOP)
+        thread.join()
+
+    def submit(self, entries: list[tuple[bytes, bytes | None]]) -> None:
+        """Schedule entries for writing — no I/O on the caller's path."""
+        for i, entry in enumerate(entries):
+            try:
+                self._queue.put_nowait(entry)
+            except queue.Full:
+                # Redis is falling behind; the gateway reads these from the DB instead
+                logger.warning("cache_writer_queue_full", dropped=len(entries) - i)
+                return
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            # The first entry of a batch waits at most one interval to be written
+            deadline = time.monotonic() + self._interval
+            batch: list[tuple[bytes, bytes | None]] = []
+            while item is not _STOP:
+                batch.append(item)
+                if len(batch) >= self._max_batch:
+                    break
+                try:
+                    item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+            if batch:
+                self._flush(batch)
+            if item is _STOP:
+                return
+
+    def _flush(self, batch: list[tuple[bytes, bytes | None]]) -> None:
+        try:
+            write_cache_entries(self._client, batch, self._ttl)
+        except Exception as exc:
+            logger.warning("cache_write_failed", error=str(exc), size=len(batch))
+            return
+        logger.debug("cache_entries_written", size=len(batch))
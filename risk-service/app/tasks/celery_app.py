@@ -5,10 +5,22 @@ This module defines the Celery app that runs as a worker, consuming
 tasks from the risk_queue.
 """
 
+import orjson
 from celery import Celery
+from kombu.serialization import register
 
 from app.core.config import settings
 
+# orjson encodes/decodes task messages several times faster than stdlib json.
+# Both services register it under the same name and content type.
+register(
+    "orjson",
+    orjson.dumps,
+    orjson.loads,
+    content_type="application/x-orjson",
+    content_encoding="utf-8",
+)
+
 celery_app = Celery(
     "riskforge_risk",
     broker=settings.celery_broker_url,
@@ -17,13 +29,15 @@ celery_app = Celery(
 )
 
 celery_app.conf.update(
-    task_serializer="json",
-    accept_content=["json"],
-    result_serializer="json",
+    task_serializer="orjson",
+    accept_content=["orjson", "json"],  # json: messages queued before the switch
+    result_serializer="orjson",
     timezone="UTC",
     enable_utc=True,
     task_track_started=True,
     task_default_queue="risk_queue",
+    worker_pool=settings.worker_pool,
+    worker_concurrency=settings.worker_concurrency,
     worker_prefetch_multiplier=1,
     task_acks_late=True,
 )
@@ -2,131 +2,506 @@
 Risk evaluation Celery tasks.
 
 Consumes transaction IDs from the queue, runs the hybrid scoring pipeline,
-updates the database, creates alerts for HIGH risk, and caches results in Redis.
+updates the database, creates alerts for HIGH risk, and caches results in Redis
+(from a background writer thread, so the ack doesn't wait on it).
+
+The gateway publishes ``evaluate_transactions`` with every ID it has queued,
+so a burst of transactions is scored with a single model call; the
+single-ID ``evaluate_transaction`` task remains for direct dispatch.
+
+Bulk producers (backfills, re-scoring jobs) should send lists of ~100 IDs
+rather than one task per ID, and skip the cache nobody is about to read. A
+backfill of unscored transactions::
+
+    group(
+        evaluate_transactions.s(ids[i:i + 100], cache_result=False)
+        for i in range(0, len(ids), 100)
+    ).apply_async()
+
+A re-scoring job (e.g. after a model update) also needs ``force=True``, or
+every ID with a live cache entry is returned as is::
+
+    group(
+        evaluate_transactions.s(ids[i:i + 100], cache_result=False, force=True)
+        for i in range(0, len(ids), 100)
+    ).apply_async()
+
+``evaluate_transaction.chunks(zip(ids), 100)`` also cuts messages by 100×,
+but each ID inside a chunk still gets its own session and model call.
 """
 
-import json
+import socket
+from datetime import datetime
 from uuid import UUID
 
+import msgspec
+import numpy as np
 import redis
 import structlog
-from sqlalchemy import create_engine, update
-from sqlalchemy.orm import Session, sessionmaker
+import zstandard
+from celery.signals import (
+    worker_init,
+    worker_process_init,
+    worker_process_shutdown,
+    worker_shutdown,
+)
+from sqlalchemy import (
+    Integer,
+    bindparam,
+    cast,
+    column,
+    create_engine,
+    extract,
+    func,
+    select,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import InterfaceError, OperationalError
+from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
-from app.services.risk_scorer import evaluate_transaction_risk
+from app.models.transaction import Alert, Transaction
+from app.services.risk_scorer import (
+    evaluate_transactions_risk_vec,
+    risk_results,
+    warm_up,
+)
+from app.tasks.cache_writer import CacheWriter, write_cache_entries
 from app.tasks.celery_app import celery_app
 
 logger = structlog.get_logger("risk_tasks")
 
 # Synchronous DB engine for Celery workers (Celery doesn't support asyncio natively)
-_sync_engine = create_engine(settings.database_url_sync, pool_size=10, max_overflow=5)
+def _process_concurrency() -> int:
+    """Tasks one worker process runs at once — what its connection pools must cover.
+
+    A prefork child runs one task at a time; thread / gevent pools run
+    worker_concurrency tasks in one process.
+    """
+    if settings.worker_pool in ("prefork", "solo"):
+        return 1
+    return settings.worker_concurrency
+
+
+# DB pool: pool_size + overflow ≈ concurrent tasks in this process
+_pool_size = _process_concurrency()
+_sync_engine = create_engine(
+    settings.database_url_sync,
+    pool_size=_pool_size,
+    max_overflow=_pool_size // 2,
+    pool_pre_ping=True,  # drop connections the server closed while the worker idled
+    pool_recycle=1800,
+    pool_use_lifo=True,  # reuse the hottest connection; idle extras age out
+    query_cache_size=1200,  # compiled statements stay cached across tasks
+)
 SyncSessionFactory = sessionmaker(bind=_sync_engine)
 
-# Synchronous Redis client for caching
-_redis_client = redis.Redis.from_url(settings.redis_url, decode_responses=True)
+# Built once; the expanding IN takes any number of IDs with one cache entry.
+# (session.get would need the full (id, created_at) primary key.)
+# Plain column rows rather than ORM objects — nothing here needs identity-map
+# tracking — and Postgres derives the scoring inputs in the same pass.
+_SELECT_BY_IDS = select(
+    # What the UPDATE key, alerts and cache entries need — not the old scores
+    Transaction.id,
+    Transaction.user_id,
+    Transaction.amount,
+    Transaction.currency,
+    Transaction.location,
+    Transaction.device_id,
+    Transaction.ip_address,
+    Transaction.transaction_time,
+    Transaction.created_at,
+    Transaction.updated_at,
+    cast(extract("hour", Transaction.transaction_time), Integer).label("hour"),
+    # Simplified: any device_id = potentially new
+    (func.coalesce(Transaction.device_id, "") != "").label("is_new_device"),
+    # Simplified: any location data = check
+    (func.coalesce(Transaction.location, "") != "").label("is_unusual_location"),
+).where(Transaction.id.in_(bindparam("ids", expanding=True)))
+
+# Synchronous Redis client for caching. Connections are reused for the life of
+# the worker process; keepalive + health checks stop idle sockets from being
+# silently dropped between tasks. Values are binary (msgpack+zstd).
+_keepalive_options = (
+    {socket.TCP_KEEPIDLE: 30} if hasattr(socket, "TCP_KEEPIDLE") else {}  # Linux only
+)
+_redis_pool = redis.BlockingConnectionPool.from_url(
+    settings.redis_url,
+    max_connections=_process_concurrency() * 2,
+    socket_keepalive=True,
+    socket_keepalive_options=_keepalive_options,
+    health_check_interval=30,
+)
+_redis_client = redis.Redis(connection_pool=_redis_pool)
 
 CACHE_TTL_SECONDS = 600  # 10 minutes
 
+# Results at these levels aren't cached: blocked transactions are surfaced
+# through the alerts table and rarely fetched, and the gateway reads (and
+# then caches) them from the DB on a miss. Their key is deleted instead, so
+# an entry cached before the rescore can't keep serving the old status.
+UNCACHED_RISK_LEVELS = frozenset({"HIGH"})
+
+# Started per worker process by the signal handlers below
+cache_writer = CacheWriter(_redis_client, CACHE_TTL_SECONDS)
+
+# Must match app.core.redis.pack_cache_value in the api-gateway, which reads these
+_zstd_compressor = zstandard.ZstdCompressor(level=1)
+
+
+class TxnCacheEntry(msgspec.Struct):
+    """A scored transaction as cached for the gateway (its TransactionResponse).
+
+    Encoded as a msgpack map, the same as a packed dict: datetimes as msgpack
+    Timestamps and UUIDs as their 16 raw bytes, which pydantic reads back.
+    """
+
+    id: UUID
+    user_id: UUID
+    amount: float
+    currency: str
+    location: str | None
+    device_id: str | None
+    ip_address: str | None
+    transaction_time: datetime
+    status: str
+    rule_score: float
+    ml_score: float
+    final_score: float
+    risk_level: str
+    created_at: datetime | None
+    updated_at: datetime | None
+
+
+_cache_encoder = msgspec.msgpack.Encoder(uuid_format="bytes")
+
+
+class CachedScores(msgspec.Struct):
+    """The result fields of a cache entry (worker- or gateway-written).
+
+    Decoding straight into this skips building the entry's other fields.
+    """
+
+    ml_score: float
+    rule_score: float
+    final_score: float
+    status: str
+    risk_level: str
+
+
+_cached_scores_decoder = msgspec.msgpack.Decoder(CachedScores)
+_zstd_decompressor = zstandard.ZstdDecompressor()
+
+
+def _risk_arrays(txns) -> tuple[np.ndarray, ...]:
+    """Scoring input columns for evaluate_transactions_risk_vec, one entry per row."""
+    n = len(txns)
+    return (
+        np.fromiter((t.amount for t in txns), dtype=np.float64, count=n),
+        np.fromiter((t.hour for t in txns), dtype=np.int8, count=n),
+        np.fromiter((t.is_new_device for t in txns), dtype=bool, count=n),
+        np.fromiter((t.is_unusual_location for t in txns), dtype=bool, count=n),
+    )
+
+
+# Key columns and score columns of a bulk UPDATE parameter set, in VALUES order
+_UPDATE_KEY = ("id", "created_at")
+_UPDATE_SCORES = ("ml_score", "rule_score", "final_score", "status", "risk_level")
+
+
+def _scores_update_from_values(params: list[dict]):
+    """One ``UPDATE … FROM (VALUES …)`` statement writing every parameter set.
+
+    Postgres only — SQLite can't name a VALUES list's columns. psycopg2 sends
+    UUIDs as untyped literals, which VALUES would resolve to text, so every
+    reference casts back to the column's type.
+    """
+    table = Transaction.__table__
+    names = _UPDATE_KEY + _UPDATE_SCORES
+    data = values(
+        *(column(name, table.c[name].type) for name in names), name="data",
+    ).data([tuple(p[name] for name in names) for p in params])
+    typed = {name: cast(data.c[name], table.c[name].type) for name in names}
+    return (
+        update(table)
+        .where(*(table.c[name] == typed[name] for name in _UPDATE_KEY))
+        .values({name: typed[name] for name in _UPDATE_SCORES})
+    )
+
+
+def _score_values(txn, result: dict) -> dict:
+    """Parameter set for the bulk UPDATE — the (id, created_at) key plus the new scores."""
+    return {
+        "id": txn.id,
+        "created_at": txn.created_at,
+        "ml_score": result["ml_score"],
+        "rule_score": result["rule_score"],
+        "final_score": result["final_score"],
+        "status": result["status"],
+        "risk_level": result["risk_level"],
+    }
+
+
+def _alert_values(txn, result: dict) -> dict | None:
+    """Alert row for a HIGH-risk result, else None."""
+    if result["risk_level"] != "HIGH":
+        return None
+    logger.warning(
+        "high_risk_alert_created",
+        transaction_id=str(txn.id),
+        final_score=result["final_score"],
+    )
+    return {
+        "transaction_id": txn.id,
+        "transaction_created_at": txn.created_at,
+        "alert_type": "HIGH_RISK_TRANSACTION",
+        "message": (
+            f"Transaction {txn.id} blocked with final_score={result['final_score']:.4f}. "
+            f"Amount: {txn.amount}, ML: {result['ml_score']:.4f}, "
+            f"Rules: {result['rule_score']:.4f}"
+        ),
+    }
+
+
+def _cache_entry(txn, result: dict) -> tuple[bytes, bytes | None]:
+    """Key and packed value of the scored transaction, where the gateway looks for it.
+
+    The value is None for :data:`UNCACHED_RISK_LEVELS` — the writer deletes the key.
+    """
+    cache_key = b"txn:" + txn.id.bytes  # same raw-bytes key the gateway reads
+    if result["risk_level"] in UNCACHED_RISK_LEVELS:
+        return cache_key, None
+    entry = TxnCacheEntry(
+        id=txn.id,
+        user_id=txn.user_id,
+        amount=txn.amount,
+        currency=txn.currency,
+        location=txn.location,
+        device_id=txn.device_id,
+        ip_address=txn.ip_address,
+        transaction_time=txn.transaction_time,
+        status=result["status"],
+        rule_score=result["rule_score"],
+        ml_score=result["ml_score"],
+        final_score=result["final_score"],
+        risk_level=result["risk_level"],
+        created_at=txn.created_at,
+        updated_at=txn.updated_at,
+    )
+    return cache_key, _zstd_compressor.compress(_cache_encoder.encode(entry))
+
+
+def _evaluate(
+    transaction_ids: list[str], cache_result: bool = True, force: bool = False,
+) -> dict[str, dict]:
+    """Score, persist and cache a set of transactions; returns results by ID.
+
+    Transactions that already have a cached result are returned from Redis
+    without touching the DB — Celery delivers at least once, so retries and
+    duplicate dispatches are routine. ``force=True`` re-scores them anyway
+    (e.g. after a model update). ``cache_result=False`` deletes the results'
+    cache keys instead of writing them (e.g. for backfills nobody is waiting
+    to read).
+    """
+    results = {} if force else _cached_results(transaction_ids)
+    pending = [t for t in transaction_ids if t not in results]
+    if pending:
+        results.update(_score_and_store(pending, cache_result))
+    return results
+
+
+def _cached_results(transaction_ids: list[str]) -> dict[str, dict]:
+    """Results already in the Redis cache, by ID — one MGET for the batch.
+
+    Any entry is trusted without a freshness check: entries are only written
+    for scored rows (by this worker after commit, or by the gateway reading
+    the DB), and every rescore overwrites or deletes the key. Checking
+    ``updated_at`` against the row would cost the DB read this saves. The one
+    gap — a gateway read racing a rescore — is bounded by the cache TTL.
+
+    Best effort: an unreachable Redis or an undecodable entry is a miss.
+    """
+    try:
+        cached = _redis_client.mget([b"txn:" + UUID(t).bytes for t in transaction_ids])
+    except redis.RedisError as exc:
+        logger.warning("cached_result_lookup_failed", error=str(exc))
+        return {}
+
+    results = {}
+    for transaction_id, raw in zip(transaction_ids, cached):
+        if raw is None:
+            continue
+        try:
+            scores = _cached_scores_decoder.decode(_zstd_decompressor.decompress(raw))
+        except (msgspec.DecodeError, zstandard.ZstdError):
+            continue
+        results[transaction_id] = msgspec.structs.asdict(scores)
+        logger.info("evaluate_transaction_cached", transaction_id=transaction_id)
+    return results
+
+
+def _score_and_store(transaction_ids: list[str], cache_result: bool) -> dict[str, dict]:
+    """The full pipeline: load, score, persist and cache."""
+    with SyncSessionFactory() as session:
+        # 1. Load transactions
+        txns = session.execute(_SELECT_BY_IDS, {"ids": [UUID(t) for t in transaction_ids]}).all()
+
+        # 2. Run risk evaluation — one model call for the whole set
+        results = risk_results(evaluate_transactions_risk_vec(*_risk_arrays(txns)))
+
+        # 3–4. Update transactions, create alerts for HIGH risk — one statement
+        # each. On Postgres the UPDATE joins a VALUES list (psycopg2's
+        # executemany would send one UPDATE per row); elsewhere it's the ORM
+        # bulk UPDATE by primary key. The Alert INSERT is already multi-row;
+        # ON CONFLICT skips alerts a redelivered or forced rescore already wrote.
+        dialect = session.get_bind().dialect.name
+        params = [_score_values(txn, result) for txn, result in zip(txns, results)]
+        if params and dialect == "postgresql":
+            session.execute(_scores_update_from_values(params))
+        elif params:
+            session.execute(update(Transaction), params)
+        alerts = [
+            alert
+            for txn, result in zip(txns, results)
+            if (alert := _alert_values(txn, result)) is not None
+        ]
+        if alerts:
+            dialect_insert = pg_insert if dialect == "postgresql" else sqlite_insert
+            session.execute(
+                dialect_insert(Alert).on_conflict_do_nothing(
+                    index_elements=["transaction_id", "transaction_created_at", "alert_type"],
+                ),
+                alerts,
+            )
+        session.commit()
+
+        # 5. Cache results in Redis — handed to the background writer when it's
+        # running (the rows are committed, so the ack needn't wait), otherwise
+        # one pipelined round trip here. Without cache_result the keys are
+        # still deleted, so no earlier entry outlives the rescore.
+        entries = [
+            _cache_entry(txn, result) if cache_result else (b"txn:" + txn.id.bytes, None)
+            for txn, result in zip(txns, results)
+        ]
+        if cache_writer.running:
+            cache_writer.submit(entries)
+        elif entries:
+            # Best effort, like the lookup: the rows are committed, so a Redis
+            # failure here must not retry the batch
+            try:
+                write_cache_entries(_redis_client, entries, CACHE_TTL_SECONDS)
+            except redis.RedisError as exc:
+                logger.warning("cache_write_failed", error=str(exc), size=len(entries))
+
+        for txn, result in zip(txns, results):
+            logger.info(
+                "evaluate_transaction_complete",
+                transaction_id=str(txn.id),
+                status=result["status"],
+                risk_level=result["risk_level"],
+                final_score=result["final_score"],
+            )
+        return {str(txn.id): result for txn, result in zip(txns, results)}
+
+
+def _start_process(**_kwargs) -> None:
+    # The engine and Redis pool are built at import, in the parent. Drop any
+    # connections a forked child inherited — without closing them under the
+    # parent — so every process opens and owns its own sockets.
+    _sync_engine.dispose(close=False)
+    _redis_pool.reset()
+    warm_up()
+    cache_writer.start()
 
-@celery_app.task(name="app.tasks.risk_tasks.evaluate_transaction", bind=True, max_retries=3)
-def evaluate_transaction(self, transaction_id: str) -> dict:
+
+def _stop_process(**_kwargs) -> None:
+    cache_writer.stop()  # write out whatever is still queued
+
+
+# Prefork children must start up after the fork (the ML runtimes and the
+# writer thread don't survive it); solo and thread pools run tasks in the
+# main worker process.
+if settings.worker_pool == "prefork":
+    worker_process_init.connect(_start_process, weak=False)
+    worker_process_shutdown.connect(_stop_process, weak=False)
+else:
+    worker_init.connect(_start_process, weak=False)
+    worker_shutdown.connect(_stop_process, weak=False)
+
+
+# Retry only failures a later attempt can fix — a lost DB connection (Redis is
+# best effort, so its errors never fail a task). Anything else is a bug or bad
+# data and fails the task on the first attempt. Celery backs off 1, 2, 4 s
+# (jittered, capped at 16 s). A retry rescores rows that may already be
+# committed: the UPDATE overwrites them and the alert INSERT skips existing ones.
+_RETRY_OPTIONS = {
+    "autoretry_for": (OperationalError, InterfaceError),
+    "max_retries": 3,
+    "retry_backoff": True,
+    "retry_backoff_max": 16,
+    "retry_jitter": True,
+}
+
+
+@celery_app.task(name="app.tasks.risk_tasks.evaluate_transaction", **_RETRY_OPTIONS)
+def evaluate_transaction(
+    transaction_id: str, cache_result: bool = True, force: bool = False,
+) -> dict:
     """Evaluate the fraud risk of a transaction.
 
     Steps:
+        0. Return the cached result if there is one (unless ``force``).
         1. Load transaction from DB.
         2. Run hybrid risk scoring (ML + rules).
         3. Update transaction with scores and status.
         4. If HIGH risk, create an alert record.
-        5. Cache the result in Redis.
+        5. Cache the result in Redis, or drop any stale entry if HIGH risk
+           or ``cache_result`` is False.
 
     Args:
         transaction_id: UUID string of the transaction to evaluate.
+        cache_result: Write the result to the Redis cache (else just drop any entry).
+        force: Re-score even if a cached result exists.
 
     Returns:
         dict with scoring results.
     """
     logger.info("evaluate_transaction_start", transaction_id=transaction_id)
 
-    try:
-        with SyncSessionFactory() as session:
-            # 1. Load transaction
-            from app.models.transaction import Transaction, Alert
-
-            txn = session.query(Transaction).filter(
-                Transaction.id == UUID(transaction_id)
-            ).first()
-
-            if txn is None:
-                logger.error("transaction_not_found", transaction_id=transaction_id)
-                return {"error": "Transaction not found"}
-
-            # 2. Run risk evaluation
-            result = evaluate_transaction_risk(
-                amount=float(txn.amount),
-                hour=txn.transaction_time.hour,
-                is_new_device=bool(txn.device_id),  # Simplified: any device_id = potentially new
-                is_unusual_location=bool(txn.location),  # Simplified: any location data = check
-            )
+    results = _evaluate([transaction_id], cache_result, force)
 
-            # 3. Update transaction
-            txn.ml_score = result["ml_score"]
-            txn.rule_score = result["rule_score"]
-            txn.final_score = result["final_score"]
-            txn.status = result["status"]
-            txn.risk_level = result["risk_level"]
-            session.flush()
-
-            # 4. Create alert if HIGH risk
-            if result["risk_level"] == "HIGH":
-                alert = Alert(
-                    transaction_id=txn.id,
-                    alert_type="HIGH_RISK_TRANSACTION",
-                    message=(
-                        f"Transaction {txn.id} blocked with final_score={result['final_score']:.4f}. "
-                        f"Amount: {txn.amount}, ML: {result['ml_score']:.4f}, "
-                        f"Rules: {result['rule_score']:.4f}"
-                    ),
-                )
-                session.add(alert)
-                logger.warning(
-                    "high_risk_alert_created",
-                    transaction_id=transaction_id,
-                    final_score=result["final_score"],
-                )
-
-            session.commit()
-
-            # 5. Cache result in Redis
-            cache_key = f"txn_result:{transaction_id}"
-            cache_data = {
-                "id": transaction_id,
-                "user_id": str(txn.user_id),
-                "amount": float(txn.amount),
-                "currency": txn.currency,
-                "location": txn.location,
-                "device_id": txn.device_id,
-                "ip_address": txn.ip_address,
-                "transaction_time": txn.transaction_time.isoformat(),
-                "status": result["status"],
-                "rule_score": result["rule_score"],
-                "ml_score": result["ml_score"],
-                "final_score": result["final_score"],
-                "risk_level": result["risk_level"],
-                "created_at": txn.created_at.isoformat() if txn.created_at else None,
-                "updated_at": txn.updated_at.isoformat() if txn.updated_at else None,
-            }
-            _redis_client.setex(cache_key, CACHE_TTL_SECONDS, json.dumps(cache_data))
+    if transaction_id not in results:
+        logger.error("transaction_not_found", transaction_id=transaction_id)
+        return {"error": "Transaction not found"}
+    return results[transaction_id]
 
-            logger.info(
-                "evaluate_transaction_complete",
-                transaction_id=transaction_id,
-                status=result["status"],
-                risk_level=result["risk_level"],
-                final_score=result["final_score"],
-            )
-            return result
 
-    except Exception as exc:
-        logger.error("evaluate_transaction_error", transaction_id=transaction_id, error=str(exc))
-        raise self.retry(exc=exc, countdown=2 ** self.request.retries)
+@celery_app.task(name="app.tasks.risk_tasks.evaluate_transactions", **_RETRY_OPTIONS)
+def evaluate_transactions(
+    transaction_ids: list[str], cache_result: bool = True, force: bool = False,
+) -> dict[str, dict]:
+    """Evaluate a batch of transactions with a single ML model call.
+
+    Same pipeline as :func:`evaluate_transaction`; a lost DB connection
+    retries the whole batch, rescoring any rows already committed without
+    alerting on them twice.
+
+    Args:
+        transaction_ids: UUID strings of the transactions to evaluate.
+        cache_result: Write the results to the Redis cache (else just drop any entries).
+        force: Re-score even those with a cached result.
+
+    Returns:
+        dict mapping each found transaction ID to its scoring results.
+    """
+    logger.info("evaluate_transactions_start", size=len(transaction_ids))
+
+    results = _evaluate(transaction_ids, cache_result, force)
+
+    missing = [t for t in transaction_ids if t not in results]
+    if missing:
+        logger.error("transaction_not_found", transaction_ids=missing)
+    return results
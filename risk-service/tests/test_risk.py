@@ -1,14 +1,37 @@
 """
-Risk Service tests — rule engine, scoring, and decision logic.
+Risk Service tests — rule engine, scoring, decision logic, and task persistence.
 """
 
+import itertools
+import math
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import msgspec
+import numpy as np
 import pytest
+import redis
+import zstandard
+from sqlalchemy import create_engine, event, func, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
 
-from app.services.rule_engine import compute_rule_score
+from app.models.transaction import Alert, Base, RiskLevel, Transaction
+from app.services.rule_engine import (
+    MAX_RAW_SCORE,
+    compute_rule_score,
+    compute_rule_score_batch,
+)
 from app.services.risk_scorer import (
     compute_hybrid_score,
     determine_risk_decision,
+    evaluate_transaction_risk,
+    evaluate_transaction_risk_batch,
 )
+from app.tasks import risk_tasks
 
 
 # ── Rule Engine Tests ─────────────────────────────────────────────────────────
@@ -16,62 +39,45 @@ from app.services.risk_scorer import (
 class TestRuleEngine:
     """Tests for the deterministic rule-based scoring."""
 
-    def test_no_risk_flags(self):
-        """Normal transaction → score = 0."""
-        score = compute_rule_score(
-            amount=500, hour=14, is_new_device=False, is_unusual_location=False,
-        )
-        assert score == 0.0
-
-    def test_high_amount(self):
-        """amount > 50000 triggers +30 → 30/80."""
-        score = compute_rule_score(
-            amount=100_000, hour=14, is_new_device=False, is_unusual_location=False,
-        )
-        assert score == pytest.approx(30 / 80)
-
-    def test_night_transaction(self):
-        """Night hour triggers +10 → 10/80."""
+    # Every score is a multiple of 1/80, so compare raw points exactly
+    @pytest.mark.parametrize(
+        ("amount", "hour", "is_new_device", "is_unusual_location", "points"),
+        [
+            pytest.param(500, 14, False, False, 0, id="no-risk-flags"),
+            pytest.param(100_000, 14, False, False, 30, id="high-amount"),
+            pytest.param(500, 3, False, False, 10, id="night"),
+            pytest.param(500, 22, False, False, 10, id="hour-22-is-night"),
+            pytest.param(500, 14, True, False, 20, id="new-device"),
+            pytest.param(500, 14, False, True, 20, id="unusual-location"),
+            pytest.param(100_000, 2, True, True, 80, id="all-flags"),
+            pytest.param(500, 14, True, True, 40, id="device-and-location"),
+        ],
+    )
+    def test_rule_points(self, amount, hour, is_new_device, is_unusual_location, points):
         score = compute_rule_score(
-            amount=500, hour=3, is_new_device=False, is_unusual_location=False,
+            amount=amount, hour=hour,
+            is_new_device=is_new_device, is_unusual_location=is_unusual_location,
         )
-        assert score == pytest.approx(10 / 80)
+        assert score * MAX_RAW_SCORE == points
 
-    def test_late_night_boundary(self):
-        """Hour 22 is still night."""
-        score = compute_rule_score(
-            amount=500, hour=22, is_new_device=False, is_unusual_location=False,
-        )
-        assert score == pytest.approx(10 / 80)
 
-    def test_new_device(self):
-        """New device triggers +20 → 20/80."""
-        score = compute_rule_score(
-            amount=500, hour=14, is_new_device=True, is_unusual_location=False,
-        )
-        assert score == pytest.approx(20 / 80)
+class TestRuleEngineBatch:
+    """The vectorised rule engine must agree with the scalar one."""
 
-    def test_unusual_location(self):
-        """Unusual location triggers +20 → 20/80."""
-        score = compute_rule_score(
-            amount=500, hour=14, is_new_device=False, is_unusual_location=True,
+    def test_matches_scalar_for_every_combination(self):
+        cases = list(itertools.product(
+            [0.0, 50_000.0, 50_000.01, 100_000.0], range(24), [False, True], [False, True],
+        ))
+        amounts, hours, new_dev, unusual = (np.array(col) for col in zip(*cases))
+        scores = compute_rule_score_batch(
+            amounts, hours.astype(np.int8), new_dev, unusual,
         )
-        assert score == pytest.approx(20 / 80)
-
-    def test_all_flags_active(self):
-        """All rules triggered → max = 1.0."""
-        score = compute_rule_score(
-            amount=100_000, hour=2, is_new_device=True, is_unusual_location=True,
-        )
-        assert score == 1.0
-
-    def test_multiple_flags(self):
-        """New device + unusual location → (20+20)/80 = 0.5."""
-        score = compute_rule_score(
-            amount=500, hour=14, is_new_device=True, is_unusual_location=True,
-        )
-        assert score == pytest.approx(40 / 80)
-
+        assert scores.dtype == np.float32
+        expected = [
+            compute_rule_score(amount=a, hour=h, is_new_device=d, is_unusual_location=u)
+            for a, h, d, u in cases
+        ]
+        assert scores.tolist() == expected
 
 # ── Hybrid Scoring Tests ─────────────────────────────────────────────────────
 
@@ -101,32 +107,438 @@ class TestHybridScoring:
 class TestRiskDecision:
     """Tests for score → status + risk_level mapping."""
 
-    def test_approved_low(self):
-        status, level = determine_risk_decision(0.2)
-        assert status == "APPROVED"
-        assert level == "LOW"
-
-    def test_approved_boundary(self):
-        status, level = determine_risk_decision(0.39)
-        assert status == "APPROVED"
-        assert level == "LOW"
-
-    def test_flagged_at_boundary(self):
-        status, level = determine_risk_decision(0.4)
-        assert status == "FLAGGED"
-        assert level == "MEDIUM"
-
-    def test_flagged_mid(self):
-        status, level = determine_risk_decision(0.6)
-        assert status == "FLAGGED"
-        assert level == "MEDIUM"
-
-    def test_blocked_at_boundary(self):
-        status, level = determine_risk_decision(0.75)
-        assert status == "BLOCKED"
-        assert level == "HIGH"
-
-    def test_blocked_high(self):
-        status, level = determine_risk_decision(0.95)
-        assert status == "BLOCKED"
-        assert level == "HIGH"
+    @pytest.mark.parametrize(
+        ("final_score", "expected"),
+        [
+            (0.2, ("APPROVED", "LOW")),
+            (0.39, ("APPROVED", "LOW")),
+            (0.4, ("FLAGGED", "MEDIUM")),
+            (0.6, ("FLAGGED", "MEDIUM")),
+            (0.75, ("BLOCKED", "HIGH")),
+            (0.95, ("BLOCKED", "HIGH")),
+        ],
+    )
+    def test_decision(self, final_score, expected):
+        assert determine_risk_decision(final_score) == expected
+
+    def test_thresholds_are_exact(self):
+        """The float just below each threshold still falls in the lower band."""
+        assert determine_risk_decision(math.nextafter(0.4, 0)) == ("APPROVED", "LOW")
+        assert determine_risk_decision(math.nextafter(0.75, 0)) == ("FLAGGED", "MEDIUM")
+
+    def test_vectorised_matches_scalar(self):
+        from app.services.risk_scorer import determine_risk_decisions_vec
+
+        scores = np.array([
+            0.0, math.nextafter(0.4, 0), 0.4, 0.6, math.nextafter(0.75, 0), 0.75, 1.0, math.nan,
+        ])
+        statuses, risk_levels = determine_risk_decisions_vec(scores)
+        assert list(zip(statuses, risk_levels)) == [determine_risk_decision(s) for s in scores]
+        assert determine_risk_decision(math.nan) == ("BLOCKED", "HIGH")
+
+
+# ── Batch Evaluation Tests ────────────────────────────────────────────────────
+
+class TestBatchEvaluation:
+    """The batched pipeline must agree with the per-transaction one."""
+
+    def test_batch_matches_scalar(self):
+        transactions = [
+            {"amount": 100.0, "hour": 12, "is_new_device": False, "is_unusual_location": False},
+            {"amount": 60_000.0, "hour": 23, "is_new_device": True, "is_unusual_location": True},
+            {"amount": 5_000.0, "hour": 3, "is_new_device": True, "is_unusual_location": False},
+        ]
+        expected = [evaluate_transaction_risk(**t) for t in transactions]
+        assert evaluate_transaction_risk_batch(transactions) == expected
+
+    def test_benign_transactions_skip_the_model(self):
+        benign = {"amount": 120.0, "hour": 14, "is_new_device": False, "is_unusual_location": False}
+        risky = {"amount": 120.0, "hour": 2, "is_new_device": False, "is_unusual_location": False}
+        with patch("app.services.risk_scorer.predict_fraud_probability") as predict, \
+                patch("app.services.risk_scorer.predict_fraud_probability_matrix") as predict_batch:
+            predict_batch.return_value = np.array([0.9])
+            scalar = evaluate_transaction_risk(**benign)
+            batch = evaluate_transaction_risk_batch([benign, risky])
+
+        predict.assert_not_called()
+        assert predict_batch.call_count == 1
+        assert len(predict_batch.call_args.args[0]) == 1  # only the night transaction
+        assert scalar == batch[0]
+        assert scalar["ml_score"] == 0.0
+        assert scalar["status"] == "APPROVED"
+        assert batch[1]["ml_score"] == 0.9
+
+    def test_vectorised_decisions_match_scalar(self):
+        from app.services.risk_scorer import evaluate_transactions_risk_vec
+
+        ml = np.linspace(0.0, 1.0, 41)
+        n = len(ml)
+        with patch("app.services.risk_scorer.predict_fraud_probability_matrix", return_value=ml):
+            scored = evaluate_transactions_risk_vec(
+                np.full(n, 60_000.0), np.full(n, 12, dtype=np.int8),
+                np.zeros(n, dtype=bool), np.ones(n, dtype=bool),
+            )
+
+        for i in range(n):
+            final = compute_hybrid_score(ml[i], 50 / 80)
+            assert scored["final_score"][i] == final
+            assert (scored["status"][i], scored["risk_level"][i]) == determine_risk_decision(final)
+
+    def test_results_share_decision_strings(self):
+        from app.services.risk_scorer import DECISIONS
+
+        transactions = [
+            {"amount": 100.0, "hour": 12, "is_new_device": False, "is_unusual_location": False},
+            {"amount": 200.0, "hour": 12, "is_new_device": False, "is_unusual_location": False},
+        ]
+        first, second = evaluate_transaction_risk_batch(transactions)
+        assert first["status"] is second["status"] is DECISIONS[0][0]
+        assert first["risk_level"] is DECISIONS[0][1]
+
+    def test_empty_batch(self):
+        assert evaluate_transaction_risk_batch([]) == []
+
+    def test_warm_up_runs_both_model_paths(self):
+        from app.services.risk_scorer import warm_up
+
+        with patch("app.services.risk_scorer.load_model") as load_model, \
+                patch("app.services.risk_scorer.predict_fraud_probability",
+                      return_value=0.5) as predict, \
+                patch("app.services.risk_scorer.predict_fraud_probability_matrix",
+                      return_value=np.array([0.5])) as predict_batch:
+            warm_up()
+
+        load_model.assert_called_once()
+        predict.assert_called_once()
+        predict_batch.assert_called_once()
+
+
+# ── Task Persistence Tests ────────────────────────────────────────────────────
+
+_NIGHT = datetime(2025, 6, 15, 2, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def worker_db():
+    """An in-memory database the worker's sessions are bound to; yields the factory."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine, expire_on_commit=False)
+    with patch.object(risk_tasks, "SyncSessionFactory", session_factory):
+        yield session_factory
+
+
+def add_transactions(session_factory, *amounts: float) -> list[Transaction]:
+    """Insert one night-time transaction on a known device per amount."""
+    with session_factory() as session:
+        txns = [
+            Transaction(user_id=uuid.uuid4(), amount=amount, transaction_time=_NIGHT,
+                        device_id="device-abc", location="Lagos", created_at=_NIGHT)
+            for amount in amounts
+        ]
+        session.add_all(txns)
+        session.commit()
+    return txns
+
+
+def _pipeline(redis_client: MagicMock) -> MagicMock:
+    return redis_client.pipeline.return_value.__enter__.return_value
+
+
+class TestEvaluateTask:
+    """The worker writes scores and alerts back in bulk statements."""
+
+    def test_scores_and_alerts_are_written_in_bulk(self, worker_db):
+        txns = add_transactions(worker_db, 200.0, 90_000.0)
+        ids = [str(t.id) for t in txns]
+
+        statements = []
+        event.listen(
+            worker_db.kw["bind"], "before_cursor_execute",
+            lambda conn, cursor, stmt, params, ctx, many: statements.append(stmt.split()[0]),
+        )
+        redis_client = MagicMock()
+        pipe = _pipeline(redis_client)
+        with patch.object(risk_tasks, "_redis_client", redis_client), \
+                patch("app.services.risk_scorer.predict_fraud_probability_matrix",
+                      return_value=np.array([0.1, 0.99])):
+            results = risk_tasks._evaluate(ids)
+
+        assert statements == ["SELECT", "UPDATE", "INSERT"]
+        # HIGH results are left for the gateway to read through from the DB
+        assert [c.args[0] for c in pipe.setex.call_args_list] == [
+            b"txn:" + uuid.UUID(ids[0]).bytes,
+        ]
+        assert [c.args[0] for c in pipe.delete.call_args_list] == [
+            b"txn:" + uuid.UUID(ids[1]).bytes,
+        ]
+        assert results[ids[1]]["risk_level"] == "HIGH"
+        with worker_db() as session:
+            stored = {str(t.id): t for t in session.scalars(select(Transaction))}
+            alerts = session.scalars(select(Alert)).all()
+        assert stored[ids[1]].risk_level is RiskLevel.HIGH
+        assert stored[ids[0]].final_score == pytest.approx(results[ids[0]]["final_score"])
+        assert [str(a.transaction_id) for a in alerts] == [ids[1]]
+
+    def test_rescoring_a_high_transaction_alerts_once(self, worker_db):
+        (txn,) = add_transactions(worker_db, 90_000.0)
+
+        # A redelivery and a forced rescore both run the full pipeline again
+        with patch.object(risk_tasks, "_redis_client", MagicMock()), \
+                patch("app.services.risk_scorer.predict_fraud_probability_matrix",
+                      return_value=np.array([0.99])):
+            first = risk_tasks._evaluate([str(txn.id)])
+            risk_tasks._evaluate([str(txn.id)], force=True)
+
+        assert first[str(txn.id)]["risk_level"] == "HIGH"
+        with worker_db() as session:
+            assert session.scalar(select(func.count()).select_from(Alert)) == 1
+
+    def test_high_result_removes_a_stale_cache_entry(self, worker_db):
+        (txn,) = add_transactions(worker_db, 90_000.0)
+        key = b"txn:" + txn.id.bytes
+
+        store = {key: b"stale APPROVED entry"}
+        redis_client = MagicMock()
+        pipe = _pipeline(redis_client)
+        pipe.setex.side_effect = lambda k, ttl, v: store.__setitem__(k, v)
+        pipe.delete.side_effect = lambda k: store.pop(k, None)
+        # Re-scored after a model update that now rates the transaction HIGH
+        with patch.object(risk_tasks, "_redis_client", redis_client), \
+                patch("app.services.risk_scorer.predict_fraud_probability_matrix",
+                      return_value=np.array([0.99])):
+            results = risk_tasks._evaluate([str(txn.id)], force=True)
+
+        assert results[str(txn.id)]["risk_level"] == "HIGH"
+        assert key not in store
+
+    def test_uncached_rescore_removes_stale_cache_entries(self, worker_db):
+        txns = add_transactions(worker_db, 200.0, 90_000.0)
+        keys = [b"txn:" + t.id.bytes for t in txns]
+
+        store = dict.fromkeys(keys, b"stale entry")
+        redis_client = MagicMock()
+        pipe = _pipeline(redis_client)
+        pipe.delete.side_effect = lambda k: store.pop(k, None)
+        # A re-scoring job: force past the cache, but don't fill it
+        with patch.object(risk_tasks, "_redis_client", redis_client), \
+                patch("app.services.risk_scorer.predict_fraud_probability_matrix",
+                      return_value=np.array([0.1, 0.99])):
+            risk_tasks._evaluate([str(t.id) for t in txns], cache_result=False, force=True)
+
+        pipe.setex.assert_not_called()
+        assert store == {}
+
+    def test_postgres_scores_update_is_one_statement(self):
+        now = datetime.now(timezone.utc)
+        params = [
+            {"id": uuid.uuid4(), "created_at": now, "ml_score": 0.9, "rule_score": 1.0,
+             "final_score": 0.93, "status": "BLOCKED", "risk_level": "HIGH"}
+            for _ in range(3)
+        ]
+        compiled = risk_tasks._scores_update_from_values(params).compile(
+            dialect=postgresql.psycopg2.dialect(),
+        )
+        sql = str(compiled)
+        assert sql.startswith("UPDATE transactions SET")
+        assert sql.count("(%(param_") == 3  # one VALUES row per transaction
+        assert "transactions.id = CAST(data.id AS UUID)" in sql
+        assert "transactions.created_at = CAST(data.created_at AS TIMESTAMP WITH TIME ZONE)" in sql
+        bound = {
+            key: compiled._bind_processors.get(key, lambda v: v)(value)
+            for key, value in compiled.construct_params().items()
+        }
+        assert (bound["param_6"], bound["param_7"]) == (3, 2)  # BLOCKED / HIGH codes
+
+    def test_select_derives_scoring_inputs(self, worker_db):
+        evening = datetime(2025, 6, 15, 23, 30, tzinfo=timezone.utc)
+        with worker_db() as session:
+            txns = [
+                Transaction(user_id=uuid.uuid4(), amount=10.0, transaction_time=evening,
+                            device_id=device_id, location=location, created_at=evening)
+                for device_id, location in (("device-abc", None), ("", "Lagos"))
+            ]
+            session.add_all(txns)
+            session.commit()
+            rows = session.execute(risk_tasks._SELECT_BY_IDS, {"ids": [t.id for t in txns]}).all()
+
+        flags = {row.id: (row.hour, bool(row.is_new_device), bool(row.is_unusual_location))
+                 for row in rows}
+        assert flags == {txns[0].id: (23, True, False), txns[1].id: (23, False, True)}
+
+    def test_only_connection_errors_are_retried(self):
+        with patch.object(risk_tasks, "_evaluate", side_effect=ValueError("bad row")) as evaluate:
+            assert risk_tasks.evaluate_transactions.apply(args=[["a"]]).failed()
+        assert evaluate.call_count == 1
+
+        lost = OperationalError("SELECT 1", {}, Exception("server closed the connection"))
+        with patch.object(risk_tasks, "_evaluate", side_effect=lost) as evaluate:
+            assert risk_tasks.evaluate_transactions.apply(args=[["a"]]).failed()
+        assert evaluate.call_count == 1 + risk_tasks.evaluate_transactions.max_retries
+
+    def test_cache_write_failure_after_commit_is_not_retried(self, worker_db):
+        (txn,) = add_transactions(worker_db, 200.0)
+
+        redis_client = MagicMock()
+        pipe = _pipeline(redis_client)
+        pipe.execute.side_effect = redis.ConnectionError("connection reset")
+        with patch.object(risk_tasks, "_redis_client", redis_client), \
+                patch("app.services.risk_scorer.predict_fraud_probability_matrix",
+                      return_value=np.array([0.1])):
+            result = risk_tasks.evaluate_transactions.apply(args=[[str(txn.id)]])
+
+        assert result.successful()
+        assert pipe.execute.call_count == 1
+
+    def test_cache_entry_matches_the_gateway_format(self):
+        now = datetime.now(timezone.utc)
+        txn = SimpleNamespace(
+            id=uuid.uuid4(), user_id=uuid.uuid4(), amount=12.5, currency="USD",
+            location=None, device_id="device-abc", ip_address=None,
+            transaction_time=now, created_at=now, updated_at=now,
+        )
+        result = evaluate_transaction_risk(
+            amount=12.5, hour=now.hour, is_new_device=True, is_unusual_location=False,
+        )
+        key, value = risk_tasks._cache_entry(txn, result)
+
+        assert key == b"txn:" + txn.id.bytes
+        cached = msgspec.msgpack.decode(zstandard.ZstdDecompressor().decompress(value))
+        assert cached["id"] == txn.id.bytes  # raw UUID bytes, as pydantic accepts
+        assert cached["transaction_time"] == now  # a msgpack Timestamp, not a string
+        assert cached["status"] == result["status"]
+        assert len(cached) == len(risk_tasks.TxnCacheEntry.__struct_fields__)
+
+    def test_cached_results_short_circuit_scoring(self):
+        now = datetime.now(timezone.utc)
+        cached_id, fresh_id = str(uuid.uuid4()), str(uuid.uuid4())
+        txn = SimpleNamespace(
+            id=uuid.UUID(cached_id), user_id=uuid.uuid4(), amount=12.5, currency="USD",
+            location=None, device_id=None, ip_address=None,
+            transaction_time=now, created_at=now, updated_at=now,
+        )
+        cached_result = evaluate_transaction_risk(
+            amount=12.5, hour=12, is_new_device=False, is_unusual_location=False,
+        )
+        redis_client = MagicMock()
+        redis_client.mget.return_value = [risk_tasks._cache_entry(txn, cached_result)[1], None]
+        fresh_result = {**cached_result, "final_score": 0.5}
+
+        with patch.object(risk_tasks, "_redis_client", redis_client), \
+                patch.object(risk_tasks, "_score_and_store",
+                             side_effect=lambda ids, _: {t: fresh_result for t in ids}) as score:
+            results = risk_tasks._evaluate([cached_id, fresh_id])
+            assert score.call_args.args[0] == [fresh_id]
+            assert results == {cached_id: cached_result, fresh_id: fresh_result}
+
+            redis_client.mget.reset_mock()
+            risk_tasks._evaluate([cached_id, fresh_id], force=True)
+            assert score.call_args.args[0] == [cached_id, fresh_id]
+            redis_client.mget.assert_not_called()
+
+    def test_process_start_drops_inherited_connections(self):
+        with patch.object(risk_tasks, "_sync_engine") as engine, \
+                patch.object(risk_tasks, "_redis_pool") as pool, \
+                patch.object(risk_tasks, "warm_up"), \
+                patch.object(risk_tasks, "cache_writer") as writer:
+            risk_tasks._start_process()
+
+        engine.dispose.assert_called_once_with(close=False)
+        pool.reset.assert_called_once()
+        writer.start.assert_called_once()
+
+
+# ── Cache Writer Tests ────────────────────────────────────────────────────────
+
+class TestCacheWriter:
+    """Queued cache entries are written in pipelined batches off the task thread."""
+
+    def test_flushes_queued_entries_in_batches(self):
+        from app.tasks.cache_writer import CacheWriter
+
+        client = MagicMock()
+        pipe = client.pipeline.return_value.__enter__.return_value
+        writer = CacheWriter(client, ttl=600, max_batch=2)
+        entries = [(b"txn:%d" % i, b"value") for i in range(5)]
+
+        writer.start()
+        assert writer.running
+        writer.submit(entries)
+        writer.stop()
+
+        assert not writer.running
+        assert [c.args for c in pipe.setex.call_args_list] == [(k, 600, v) for k, v in entries]
+        assert pipe.execute.call_count >= 3  # never more than two entries per round trip
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        from app.tasks.cache_writer import CacheWriter
+
+        client = MagicMock()
+        pipe = client.pipeline.return_value.__enter__.return_value
+        writer = CacheWriter(client, ttl=600, max_queued=2)
+        writer.submit([(b"a", b"1"), (b"b", b"2"), (b"c", b"3")])  # not started: nothing drains
+
+        writer.start()
+        writer.stop()
+        assert [c.args[0] for c in pipe.setex.call_args_list] == [b"a", b"b"]
+
+    def test_none_value_deletes_the_key(self):
+        from app.tasks.cache_writer import write_cache_entries
+
+        client = MagicMock()
+        pipe = client.pipeline.return_value.__enter__.return_value
+        write_cache_entries(client, [(b"a", b"1"), (b"b", None)], ttl=600)
+
+        pipe.setex.assert_called_once_with(b"a", 600, b"1")
+        pipe.delete.assert_called_once_with(b"b")
+        pipe.execute.assert_called_once()
+
+
+# ── Prediction Cache Tests ────────────────────────────────────────────────────
+
+class TestPredictionCache:
+    """Repeated single-transaction inputs are scored by the model once."""
+
+    def test_repeated_features_hit_the_cache(self):
+        from app.ml import predictor
+        from app.ml.features import RiskFeatures
+
+        features = RiskFeatures(
+            amount=250.0, hour=23.0, is_night=1.0, is_new_device=1.0,
+            is_unusual_location=0.0, amount_log=math.log1p(250.0), amount_zscore=0.0,
+        )
+        predictor._cached_probability.cache_clear()
+        with patch.object(predictor, "_load_attempted", True), \
+                patch.object(predictor, "_model", object()), \
+                patch.object(predictor, "_predict", return_value=np.array([0.3])) as predict:
+            assert predictor.predict_fraud_probability(features) == pytest.approx(0.3)
+            assert predictor.predict_fraud_probability(features) == pytest.approx(0.3)
+            assert predict.call_count == 1
+
+            with patch.object(predictor, "MODEL_PATH", "missing.joblib"), \
+                    patch.object(predictor, "ONNX_MODEL_PATH", "missing.onnx"), \
+                    patch.object(predictor, "COMPILED_MODEL_PATH", "missing.so"):
+                predictor.load_model()  # a reload must drop the old model's scores
+        assert predictor._cached_probability.cache_info().currsize == 0
+
+    def test_onnx_io_binding_matches_run(self, tmp_path):
+        from xgboost import XGBClassifier
+
+        from app.ml import predictor
+        from app.ml.features import RiskFeatures
+        from app.ml.train_model import export_onnx
+
+        rng = np.random.default_rng(0)
+        X = rng.random((200, 7), dtype=np.float32)
+        model = XGBClassifier(n_estimators=10, max_depth=3).fit(X, X[:, 0] > 0.5)
+        export_onnx(model, str(tmp_path / "model.onnx"))
+        session = predictor._create_session(str(tmp_path / "model.onnx"))
+
+        predictor._cached_probability.cache_clear()
+        with patch.object(predictor, "_load_attempted", True), \
+                patch.object(predictor, "_session", session):
+            for row in X[:5]:
+                expected = session.run(["probabilities"], {"input": row[None, :]})[0][0, 1]
+                got = predictor.predict_fraud_probability(RiskFeatures(*row.tolist()))
+                assert got == pytest.approx(float(expected))
+        predictor._cached_probability.cache_clear()